@@ -1,23 +1,33 @@
-import pandas as pd, yfinance as yf
+import csv
+import pandas as pd
 from data_helpers import get_employee_count
+from public_snapshots import collect, append_snapshots, yfinance_quote
 
 def public_snapshot(ticker, sector="tech"):
-    t   = yf.Ticker(ticker)
-    mc  = t.fast_info["lastMarketCap"]
-    emp = get_employee_count(ticker)
-    rev = t.get_income_stmt().loc["Total Revenue"][0] if emp else None
+    snap, errors = collect([ticker], yfinance_quote)
+    if errors:
+        raise errors[ticker]
+    append_snapshots(snap)
+    s   = snap.iloc[0]
+    emp = get_employee_count(ticker) or s["employees"]
+    rev = s["revenue"]
     return {
         "company": ticker,
         "date": pd.Timestamp.today().strftime("%Y-%m-%d"),
-        "valuation_usd": mc,
+        "valuation_usd": s["market_cap"],
         "employees": emp,
         "accession_or_source": "yfinance/10-K",
-        "revenue_per_employee": round(rev/emp) if rev and emp else None,
+        "revenue_per_employee": round(rev/emp) if pd.notna(rev) and emp else None,
         "tech_sector": sector,
         "acquirer": "Public"
     }
 
-df = pd.read_csv("private_events.csv")
-df = pd.concat([df, pd.DataFrame([public_snapshot("NVDA","semiconductor")])], ignore_index=True)
-df.to_csv("private_events.csv", index=False)
+def append_row(path, row):
+    """Append one row under the file's existing header (no read/rewrite of the file)."""
+    with open(path, newline="") as f:
+        header = next(csv.reader(f))
+    with open(path, "a", newline="") as f:
+        csv.DictWriter(f, fieldnames=header, extrasaction="ignore").writerow(row)
+
+append_row("private_events.csv", public_snapshot("NVDA", "semiconductor"))
 print("✅ Nvidia snapshot appended to private_events.csv")
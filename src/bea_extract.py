@@ -0,0 +1,228 @@
+# src/bea_extract.py
+"""
+Single-pass extractor for BEA release workbooks (gdp4q24-3rd.xlsx,
+gdpkeysource-4q24-3rd.xlsx, ...).
+
+The workbook is opened once in openpyxl read-only mode and every sheet is
+streamed row by row. Only rows whose first cell is a line number are kept,
+so titles, "Source: ...", "Consists of ..." and the other footnotes are
+dropped in the same pass instead of by a second read/rewrite
+(clean_footnotesBEA.py). Section headings inside a table ("Addenda:",
+"Price indexes:", ...) are not kept as rows, but every line records the
+section it sits in, counted from 0 at the top of the table: they are
+the only block boundaries the workbook has. Each column's stacked header
+cells are split into a period ("2024", "2024Q1", "2024-07") and a
+measure ("Billions of dollars | Seasonally adjusted at annual rates").
+
+Output is one typed long Parquet per workbook:
+
+  data/clean/bea/<workbook>.parquet
+    table, line, section, label, indent, col, measure, period, value
+
+indent is the label cell's Excel indent level (the BEA line hierarchy).
+Cells BEA marks as not available ("....", "…") are kept as NaN so every
+line survives; empty spacer cells are skipped.
+Results are cached by workbook hash in data/clean/bea/.manifest.json,
+so an unchanged release is never parsed twice.
+
+  python src/bea_extract.py                       # every workbook in data/raw/bea
+  python src/bea_extract.py data/raw/bea/gdp4q24-3rd.xlsx
+"""
+import argparse, glob, os, re, time
+from pathlib import Path
+import openpyxl
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from fingerprint import file_digest, load_state, save_state
+
+RAW_DIR = "data/raw/bea"
+BEA_DIR = "data/clean/bea"
+
+SCHEMA = pa.schema([
+    ("table",   pa.dictionary(pa.int32(), pa.string())),
+    ("line",    pa.int16()),
+    ("section", pa.int16()),
+    ("label",   pa.string()),
+    ("indent",  pa.int8()),
+    ("col",     pa.int16()),
+    ("measure", pa.dictionary(pa.int32(), pa.string())),
+    ("period",  pa.dictionary(pa.int32(), pa.string())),
+    ("value",   pa.float64()),
+])
+
+MONTHS = {m: i for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1)}
+MONTH_RE   = re.compile(r"^(%s)[a-z]*\.?$" % "|".join(MONTHS), re.I)  # "Jul.", "July"
+YEAR_RE    = re.compile(r"^(\d{4})(?:\s*r)?$")           # 2024, "2024 r"
+QTR_RE     = re.compile(r"^Q([1-4])(?:\s*r)?$")          # Q1, "Q4 r"
+YEARQTR_RE = re.compile(r"^(\d{4})\s*Q([1-4])(?:\s*r)?$") # 2024Q2
+FOOTNOTE   = re.compile(r"\s+\d{1,2}$")                   # "Personal consumption expenditures 1"
+
+def is_line(v):
+    return isinstance(v, int) or (isinstance(v, float) and v.is_integer())
+
+def is_heading(row):
+    """Section heading inside a table: empty column A, text in the label column.
+    Footnotes, "r Revised" and "Source: ..." sit in column A instead."""
+    first = row[0].value if row else None
+    label = row[1].value if len(row) > 1 else None
+    return (first is None or not str(first).strip()) and bool(str(label or "").strip())
+
+def to_float(v):
+    """Numbers pass through; "…", "....", "(D)" and other text become None."""
+    if isinstance(v, bool) or v is None:
+        return None
+    if isinstance(v, (int, float)):
+        return float(v)
+    try:
+        return float(str(v).replace(",", ""))
+    except ValueError:
+        return None
+
+def parse_header(stack, last_year=None):
+    """(period, measure, year) from one column's header cells, top to bottom."""
+    year = sub = None
+    measure = []
+    for cell in stack:
+        s = str(cell).strip()
+        if m := YEARQTR_RE.match(s):
+            year, sub = m.group(1), f"Q{m.group(2)}"
+        elif m := YEAR_RE.match(s):
+            year = m.group(1)
+        elif m := QTR_RE.match(s):
+            sub = f"Q{m.group(1)}"
+        elif m := MONTH_RE.match(s):
+            sub = f"{MONTHS[m.group(1).lower()]:02d}"
+        elif s and s != "Line" and s not in measure:
+            measure.append(s)
+    if year is None and sub is not None:
+        year = last_year                         # "Jul." after "2024Q2"
+    if year is None:
+        period = None
+    elif sub is None:
+        period = year
+    else:
+        period = f"{year}{sub}" if sub.startswith("Q") else f"{year}-{sub}"
+    return period, " | ".join(measure), year
+
+def extract_sheet(ws):
+    """Long records for one worksheet, built while streaming its rows."""
+    header_rows, columns, records = [], None, []
+    section = 0
+    for row in ws.iter_rows():
+        first = row[0].value if row else None
+        if not is_line(first):
+            if columns is None:
+                header_rows.append([c.value for c in row])
+            elif is_heading(row):
+                section += 1                           # "Addenda:", "Price indexes:", ...
+            continue                                   # titles and footnotes are dropped
+
+        if columns is None:
+            columns = header_columns(header_rows, len(row))
+        label_cell = row[1] if len(row) > 1 else None
+        label = FOOTNOTE.sub("", str(label_cell.value or "").strip())
+        indent = int(getattr(getattr(label_cell, "alignment", None), "indent", 0) or 0)
+        for j, period, measure in columns:
+            if j >= len(row):
+                continue
+            raw = row[j].value
+            if raw is None or raw == "":
+                continue
+            # "...." / "…" cells stay as NaN so every line keeps its place in the hierarchy
+            v = to_float(raw)
+            records.append((int(first), section, label, indent, j, measure, period,
+                            float("nan") if v is None else v))
+    return records
+
+def header_columns(header_rows, width):
+    """[(col, period, measure)] for every value column, with merged header
+    cells forward-filled across the row (BEA only fills the first cell)."""
+    # titles sit in column A, so only columns C.. matter here; spacer
+    # columns picked up by the fill hold no numbers and emit nothing
+    grid = [list(r) + [None] * (width - len(r)) for r in header_rows]
+    for r in grid:
+        for j in range(3, width):
+            if r[j] is None:
+                r[j] = r[j - 1]
+    cols, last_year = [], None
+    for j in range(2, width):
+        stack = [r[j] for r in grid if r[j] is not None]
+        period, measure, last_year = parse_header(stack, last_year)
+        if period is not None:
+            cols.append((j, period, measure))
+    return cols
+
+def extract_workbook(path, sheets=None):
+    """Stream every sheet (or the named ones) of a workbook into one long frame."""
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    frames = []
+    try:
+        for name in wb.sheetnames:
+            if sheets and name not in sheets:
+                continue
+            records = extract_sheet(wb[name])
+            if records:
+                df = pd.DataFrame(records, columns=SCHEMA.names[1:])
+                df.insert(0, "table", name)
+                frames.append(df)
+    finally:
+        wb.close()
+    if not frames:
+        return pd.DataFrame(columns=SCHEMA.names)
+    return pd.concat(frames, ignore_index=True)
+
+def write_long(df, path):
+    """Atomic write, one row group per table."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    try:
+        with pq.ParquetWriter(tmp, SCHEMA, compression="zstd") as writer:
+            for _, part in df.groupby("table", sort=False):
+                writer.write_table(pa.Table.from_pandas(part, schema=SCHEMA, preserve_index=False))
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def output_path(workbook, out_dir=BEA_DIR):
+    return os.path.join(out_dir, f"{Path(workbook).stem}.parquet")
+
+def read_bea(workbook, tables=None, out_dir=BEA_DIR):
+    """Load an extracted workbook, optionally only some tables."""
+    filters = [("table", "in", list(tables))] if tables else None
+    return pd.read_parquet(output_path(workbook, out_dir), filters=filters)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Extract BEA workbooks to typed long Parquet")
+    ap.add_argument("workbooks", nargs="*", help=f"default: every .xlsx in {RAW_DIR}")
+    ap.add_argument("--out-dir", default=BEA_DIR)
+    ap.add_argument("--force", action="store_true")
+    args = ap.parse_args(argv)
+
+    books = args.workbooks or sorted(glob.glob(os.path.join(RAW_DIR, "*.xlsx")))
+    manifest_path = os.path.join(args.out_dir, ".manifest.json")
+    manifest = load_state(manifest_path)
+    stat_cache = manifest.setdefault("stat_cache", {})
+    sources = manifest.setdefault("sources", {})
+    script_hash = file_digest(__file__, stat_cache)
+
+    for book in books:
+        out = output_path(book, args.out_dir)
+        digest = f"{script_hash}:{file_digest(book, stat_cache)}"
+        if not args.force and sources.get(book) == digest and os.path.exists(out):
+            print(f"  = {Path(book).name} unchanged")
+            continue
+        t0 = time.perf_counter()
+        df = extract_workbook(book)
+        write_long(df, out)
+        sources[book] = digest
+        print(f"✓ {Path(book).name}: {df['table'].nunique()} tables, "
+              f"{len(df):,} values in {time.perf_counter() - t0:.1f}s → {out}")
+
+    save_state(manifest_path, manifest)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+# src/bea_store.py
+"""
+Long-format BEA store with the line-item hierarchy.
+
+Every table extracted by bea_extract.py goes into one file:
+
+  data/clean/bea_store.parquet
+    release, table, line, period, measure, value,
+    section, label, indent, parent_line, depth, last_line
+
+keyed by (release, table, line, period, measure). release is the workbook
+stem (gdp4q24-3rd, ...); measure only matters for tables with several
+blocks per period (Table 3: current $, chained $, change).
+
+Hierarchy. BEA nests line items through the label cell's indent. A line's
+parent is the nearest earlier line in the same section (bea_extract.py
+splits tables at headings such as "Addenda:") with a smaller indent, with
+one exception: a table's headline total (Table 1's GDP, Table 10's two
+"Corporate profits" blocks) is centred with a *larger* indent than the
+components under it, so a line indented deeper than both its neighbours
+and followed by a shallower line opens a new block as its root. Lines are
+numbered in document order, so a line's subtree is the contiguous range
+line..last_line.
+
+Index. BeaStore keeps the rows in a sorted MultiIndex, so point lookups,
+period ranges and subtree ranges are binary searches on the index rather
+than scans of a table:
+
+  s = BeaStore()
+  s.value("Table 3", 12, "2024Q3", measure="Billions of dollars | ...")
+  s.series("Table 1", 1, "2022Q1", "2024Q4")
+  s.subtree("Table 1", 7, "2024Q4")          # GPDI and everything under it
+  s.rollup("Table 3", 2, "2024Q3", "Billions of dollars | ...")  # sum of children
+  s.check_rollups("Table 3", "2024Q3", "Billions of dollars | ...")  # parents ≠ rollup
+"""
+import glob, os, sys
+import numpy as np
+import pandas as pd
+
+from bea_extract import BEA_DIR
+
+STORE_PATH = "data/clean/bea_store.parquet"
+KEY = ["release", "table", "line", "period", "measure"]
+
+# ── build ───────────────────────────────────────────────────────────
+def hierarchy(lines, indents):
+    """(parent_line, depth, last_line) arrays for one table's lines in document order."""
+    n = len(lines)
+    eff = np.asarray(indents, dtype=int).copy()
+    for i in range(n):
+        prev_ind = indents[i - 1] if i else -1
+        next_ind = indents[i + 1] if i + 1 < n else None
+        if next_ind is not None and indents[i] > prev_ind and indents[i] > next_ind:
+            eff[i] = -1                          # headline total → block root
+
+    parent = np.zeros(n, dtype=np.int16)         # 0 = no parent
+    depth  = np.zeros(n, dtype=np.int8)
+    stack  = []                                  # positions of open ancestors
+    for i in range(n):
+        while stack and eff[stack[-1]] >= eff[i]:
+            stack.pop()
+        if stack:
+            parent[i] = lines[stack[-1]]
+            depth[i]  = depth[stack[-1]] + 1
+        stack.append(i)
+
+    # subtree = the following lines deeper than this one
+    last = np.array(lines, dtype=np.int16)
+    for i in range(n):
+        j = i + 1
+        while j < n and depth[j] > depth[i]:
+            j += 1
+        last[i] = lines[j - 1]
+    return parent, depth, last
+
+def child_sign(parent_label, label):
+    """-1 for components BEA subtracts from their parent, else +1."""
+    if label.startswith("Less:"):
+        return -1
+    if parent_label.startswith("Net exports") and label.startswith("Imports"):
+        return -1
+    return 1
+
+def build_store(bea_dir=BEA_DIR, path=STORE_PATH):
+    """Combine every extracted workbook into the long store; returns rows written."""
+    frames = []
+    for f in sorted(glob.glob(os.path.join(bea_dir, "*.parquet"))):
+        df = pd.read_parquet(f)
+        df["release"] = os.path.basename(f)[:-len(".parquet")]
+        frames.append(df)
+    if not frames:
+        raise FileNotFoundError(f"no extracted workbooks in {bea_dir}; run bea_extract.py")
+    df = pd.concat(frames, ignore_index=True)
+    for c in ("table", "measure", "period"):
+        df[c] = df[c].astype(str)
+
+    lines = df.drop_duplicates(["release", "table", "line"]).sort_values(["release", "table", "line"])
+    parts = []
+    # each section ("Addenda:", "Price indexes:", ...) starts a fresh hierarchy
+    for _, g in lines.groupby(["release", "table", "section"], sort=False):
+        parent, depth, last = hierarchy(g["line"].to_list(), g["indent"].to_list())
+        parts.append(g[["release", "table", "line"]].assign(
+            parent_line=parent, depth=depth, last_line=last))
+    df = df.merge(pd.concat(parts), on=["release", "table", "line"], how="left")
+
+    df = df.sort_values(KEY)[KEY + ["value", "section", "label", "indent",
+                                    "parent_line", "depth", "last_line"]]
+    for c in ("release", "table", "measure", "period"):
+        df[c] = df[c].astype("category")
+    tmp = f"{path}.tmp"
+    df.to_parquet(tmp, index=False, compression="zstd")
+    os.replace(tmp, path)
+    return len(df)
+
+# ── query ───────────────────────────────────────────────────────────
+def period_freq(p):
+    """"2024" → A, "2024Q3" → Q, "2024-07" → M."""
+    return "Q" if "Q" in p else "M" if "-" in p else "A"
+
+class BeaStore:
+    def __init__(self, path=STORE_PATH):
+        df = pd.read_parquet(path)
+        for c in ("release", "table", "measure", "period"):
+            df[c] = df[c].astype(str)
+        self.lines = (df.drop_duplicates(["release", "table", "line"])
+                        [["release", "table", "line", "section", "label", "indent",
+                          "parent_line", "depth", "last_line"]]
+                        .set_index(["release", "table", "line"]).sort_index())
+        self.data = df.set_index(KEY)[["value"]].sort_index()
+        tables = self.lines.index.droplevel("line").unique()
+        self._release = (pd.Series(tables.get_level_values(0), index=tables.get_level_values(1))
+                           .groupby(level=0).agg(list).to_dict())
+
+    def _rel(self, table, release):
+        if release is not None:
+            return release
+        rels = self._release.get(table)
+        if not rels:
+            raise KeyError(f"unknown BEA table {table!r}")
+        if len(rels) > 1:
+            raise KeyError(f"{table!r} is in several releases {rels}; pass release=")
+        return rels[0]
+
+    def _pick(self, rows, measure):
+        """Rows indexed by (…, measure): filter to one measure, or require it's unambiguous."""
+        ms = rows.index.get_level_values("measure")
+        if measure is not None:
+            return rows[ms == measure]
+        if ms.nunique() > 1:
+            raise KeyError(f"several measures match, pass measure= one of {sorted(ms.unique())}")
+        return rows
+
+    def value(self, table, line, period, measure=None, release=None):
+        """Point lookup → float (NaN if BEA shows no value)."""
+        rel = self._rel(table, release)
+        try:
+            rows = self.data.loc[(rel, table, line, period)]
+        except KeyError:
+            return np.nan
+        rows = self._pick(rows, measure)                 # indexed by measure
+        return float(rows["value"].iloc[0]) if len(rows) else np.nan
+
+    def series(self, table, line, start=None, end=None, measure=None, release=None):
+        """Period range for one line → Series indexed by period.
+        Only periods of the same frequency as start/end are kept ("2024"
+        sorts between "2023Q4" and "2024Q1")."""
+        rel = self._rel(table, release)
+        rows = self.data.loc[pd.IndexSlice[rel, table, line, start:end], :]
+        if start or end:
+            freq = period_freq(start or end)
+            periods = rows.index.get_level_values("period")
+            rows = rows[[period_freq(p) == freq for p in periods]]
+        rows = self._pick(rows, measure)
+        return rows["value"].droplevel(["release", "table", "line", "measure"])
+
+    def children(self, table, line, release=None):
+        rel = self._rel(table, release)
+        node = self.lines.loc[(rel, table, line)]
+        sub = self.lines.loc[pd.IndexSlice[rel, table, line + 1:node["last_line"]], :]
+        return sub[sub["parent_line"] == line].reset_index(["release", "table"], drop=True)
+
+    def subtree(self, table, line, period=None, measure=None, release=None):
+        """A line and all its descendants (one index range), optionally at one period."""
+        rel = self._rel(table, release)
+        last = int(self.lines.loc[(rel, table, line), "last_line"])
+        rows = self.data.loc[pd.IndexSlice[rel, table, line:last], :]
+        if period is not None:
+            rows = rows[rows.index.get_level_values("period") == period]
+        if measure is not None:
+            rows = rows[rows.index.get_level_values("measure") == measure]
+        out = rows.reset_index(["release", "table"], drop=True).reset_index()
+        return out.merge(self.lines.loc[(rel, table)].reset_index(), on="line")
+
+    def rollup(self, table, line, period, measure=None, release=None):
+        """Signed sum of a line's direct children at one period (compare with value()).
+        "Less: ..." children and Imports under Net exports are subtracted."""
+        parent = self.lines.loc[(self._rel(table, release), table, line), "label"]
+        kids = self.children(table, line, release)
+        sign = pd.Series(np.where([child_sign(parent, k) < 0 for k in kids["label"]], -1.0, 1.0),
+                         index=kids.index)
+        sub = self.subtree(table, line, period, measure, release)
+        if measure is None and sub["measure"].nunique() > 1:
+            raise KeyError(f"several measures match, pass measure= one of {sorted(sub['measure'].unique())}")
+        sub = sub[sub["line"].isin(kids.index)]
+        return float((sub["value"] * sub["line"].map(sign)).sum())
+
+    def check_rollups(self, table, period, measure=None, release=None, tol=0.05):
+        """Parents whose rollup() differs from their value() by more than
+        BEA's rounding, tol (half the last digit) per line in the sum. Only
+        additive measures (levels) roll up: percent changes and indexes do not."""
+        rel = self._rel(table, release)
+        lines = self.lines.loc[(rel, table)]
+        rows = []
+        for line in lines.index[lines.index.isin(lines["parent_line"])]:
+            value = self.value(table, line, period, measure, rel)
+            total = self.rollup(table, line, period, measure, rel)
+            slack = tol * (1 + (lines["parent_line"] == line).sum())
+            if np.isfinite(value) and abs(total - value) > slack + 1e-9:
+                rows.append({"line": line, "label": lines.at[line, "label"],
+                             "value": value, "rollup": total})
+        return pd.DataFrame(rows, columns=["line", "label", "value", "rollup"])
+
+if __name__ == "__main__":
+    n = build_store(*sys.argv[1:2])
+    print(f"✔ {STORE_PATH}: {n:,} rows")
+
+    # Table 1 holds percent changes, which do not add up; its lines 1–26 are
+    # Table 3's first block, whose current-dollar levels must
+    s = BeaStore()
+    bad = s.check_rollups("Table 3", "2024Q3", "Billions of dollars | Seasonally adjusted at annual rates")
+    if len(bad):
+        print(f"⚠️  Table 3 parents that do not equal their components:\n{bad.to_string(index=False)}")
+    else:
+        print("✔ Table 3 rollups match every parent line (2024Q3, current dollars)")
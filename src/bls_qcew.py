@@ -0,0 +1,159 @@
+# src/bls_qcew.py
+"""
+Streaming ingester for BLS QCEW annual/quarterly CSVs.
+
+QCEW files are wide (42 columns in the annual layout) and the full
+all-years, all-industries set runs to many gigabytes, so nothing here
+loads a whole file. pyarrow's streaming CSV reader pulls BLOCK_SIZE bytes
+at a time, keeps only the columns in KEEP, and types them on the way in:
+
+  • area_fips, own_code, industry_code, agglvl_code, size_code, qtr,
+    disclosure_code  → dictionary-encoded strings (categories in pandas)
+  • year → int16, counts, wages and pay → int64
+
+Batches go straight to a Parquet dataset partitioned by year and
+aggregation level:
+
+  data/clean/qcew/year=1975/agglvl_code=10/<source>-0.parquet
+
+Memory is bounded by the block size and the writer's open-file limit, not
+by the input size. Unchanged sources are skipped via a manifest, and
+re-ingesting a source replaces only its own part files.
+
+  python src/bls_qcew.py                      # every QCEW CSV in data/raw/bls
+  python src/bls_qcew.py path/to/2023.q1-q4.singlefile.csv
+"""
+import argparse, csv, glob, os, re, time
+from pathlib import Path
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+
+from fingerprint import file_digest, load_state, save_state
+
+RAW_DIR    = "data/raw/bls"
+QCEW_DIR   = "data/clean/qcew"
+BLOCK_SIZE = 16 << 20            # bytes of CSV per streamed batch
+
+CODE = pa.dictionary(pa.int32(), pa.string())
+KEEP = {
+    # codes
+    "area_fips": CODE, "own_code": CODE, "industry_code": CODE, "agglvl_code": CODE,
+    "size_code": CODE, "qtr": CODE, "disclosure_code": CODE,
+    "year": pa.int16(),
+    # annual layout
+    "annual_avg_estabs_count": pa.int64(), "annual_avg_emplvl": pa.int64(),
+    "total_annual_wages": pa.int64(), "annual_avg_wkly_wage": pa.int64(),
+    "avg_annual_pay": pa.int64(),
+    # quarterly layout
+    "qtrly_estabs_count": pa.int64(), "month1_emplvl": pa.int64(),
+    "month2_emplvl": pa.int64(), "month3_emplvl": pa.int64(),
+    "total_qtrly_wages": pa.int64(), "avg_wkly_wage": pa.int64(),
+}
+PARTITION = ["year", "agglvl_code"]
+
+def header(path):
+    with open(path, newline="") as fh:
+        return next(csv.reader(fh), [])
+
+def is_qcew(path):
+    """True for a QCEW data file (has area_fips and agglvl_code columns)."""
+    cols = header(path)
+    return "area_fips" in cols and "agglvl_code" in cols
+
+def source_stem(path):
+    return re.sub(r"[^\w]+", "_", Path(path).stem).strip("_").lower()
+
+def stream_batches(path, block_size=BLOCK_SIZE):
+    """(schema, iterator of RecordBatches) for the projected, typed columns."""
+    cols = [c for c in header(path) if c in KEEP]
+    missing = {"year", "agglvl_code"} - set(cols)
+    if missing:
+        raise ValueError(f"{path}: not a QCEW file (no {', '.join(sorted(missing))})")
+    reader = pacsv.open_csv(
+        path,
+        read_options=pacsv.ReadOptions(block_size=block_size),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=cols,
+            column_types={c: KEEP[c] for c in cols},
+            strings_can_be_null=True,
+        ),
+    )
+    return reader.schema, iter(reader)
+
+def ingest(path, root=QCEW_DIR, block_size=BLOCK_SIZE):
+    """Stream one CSV into the partitioned dataset; returns rows written."""
+    stem = source_stem(path)
+    # a re-ingest replaces this source's parts and leaves other sources alone
+    for old in glob.glob(os.path.join(root, "*", "*", f"{stem}-*.parquet")):
+        os.remove(old)
+
+    schema, batches = stream_batches(path, block_size)
+    rows = 0
+    def counted():
+        nonlocal rows
+        for b in batches:
+            rows += b.num_rows
+            yield b
+
+    part_schema = pa.schema([schema.field(c) for c in PARTITION])
+    ds.write_dataset(
+        counted(), root, schema=schema, format="parquet",
+        partitioning=ds.partitioning(part_schema, flavor="hive"),
+        basename_template=f"{stem}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        max_open_files=256,
+        max_rows_per_group=1 << 17,
+        file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+    )
+    return rows
+
+def read_qcew(root=QCEW_DIR, columns=None, filter=None):
+    """Open the dataset as a pandas frame; codes come back as categories."""
+    # explicit key types: inference would turn agglvl_code "10" into int 10
+    part = ds.partitioning(pa.schema([("year", pa.int16()), ("agglvl_code", pa.string())]),
+                           flavor="hive")
+    dataset = ds.dataset(root, format="parquet", partitioning=part,
+                         exclude_invalid_files=True)
+    df = dataset.to_table(columns=columns, filter=filter).to_pandas()
+    if "agglvl_code" in df:
+        df["agglvl_code"] = df["agglvl_code"].astype("category")
+    return df
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Stream QCEW CSVs into partitioned Parquet")
+    ap.add_argument("files", nargs="*", help=f"QCEW CSVs (default: every one in {RAW_DIR})")
+    ap.add_argument("--root", default=QCEW_DIR)
+    ap.add_argument("--block-mb", type=int, default=BLOCK_SIZE >> 20)
+    ap.add_argument("--force", action="store_true", help="re-ingest unchanged files")
+    args = ap.parse_args(argv)
+
+    files = args.files or [f for f in sorted(glob.glob(os.path.join(RAW_DIR, "*.csv")))
+                           if is_qcew(f)]
+    manifest_path = os.path.join(args.root, ".manifest.json")
+    manifest = load_state(manifest_path)
+    stat_cache = manifest.setdefault("stat_cache", {})
+    sources = manifest.setdefault("sources", {})
+    script_hash = file_digest(__file__, stat_cache)
+
+    os.makedirs(args.root, exist_ok=True)
+    for f in files:
+        digest = f"{script_hash}:{file_digest(f, stat_cache)}"
+        if not args.force and sources.get(f) == digest:
+            print(f"  = {Path(f).name} unchanged")
+            continue
+        t0 = time.perf_counter()
+        try:
+            n = ingest(f, args.root, args.block_mb << 20)
+        except Exception as e:
+            print(f"⚠️  could not ingest {f}: {e}")
+            continue
+        sources[f] = digest
+        save_state(manifest_path, manifest)
+        print(f"✓ {Path(f).name}: {n:,} rows in {time.perf_counter() - t0:.1f}s")
+
+    save_state(manifest_path, manifest)
+    print(f"🏁 QCEW dataset in {args.root}/")
+
+if __name__ == "__main__":
+    main()
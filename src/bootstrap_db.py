@@ -3,39 +3,12 @@ bootstrap_db.py
 Creates the econ_panel database AND the three core tables,
 then prints the MySQL version to prove the connection works.
 """
-from sqlalchemy import create_engine, text
 import os
-from dotenv import load_dotenv
+from sqlalchemy import text
+from db import get_engine
 
-# ── 1. read credentials ──────────────────────────────────────────
-load_dotenv()                                      # .env in same folder
-user = os.getenv("MYSQL_USER", "root")
-pw   = os.getenv("MYSQL_PW",   "")
-host = os.getenv("MYSQL_HOST", "localhost")
-port = os.getenv("MYSQL_PORT", "3306")
-db   = os.getenv("MYSQL_DB",   "econ_panel")
+db = os.getenv("MYSQL_DB", "econ_panel")
 
-# ── 2. connect to the *server*, no db name ───────────────────────
-engine_root = create_engine(
-    f"mysql+mysqlconnector://{user}:{pw}@{host}:{port}/",
-    echo=False                        # turn to True if you want SQL logs
-)
-
-# ── 3. create the database if it doesn't exist ───────────────────
-with engine_root.begin() as conn:
-    conn.execute(text(
-        f"CREATE DATABASE IF NOT EXISTS {db} "
-        "CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;"
-    ))
-print(f"✔  Database '{db}' ready.")
-
-# ── 4. reconnect *into* the new db ───────────────────────────────
-engine = create_engine(
-    f"mysql+mysqlconnector://{user}:{pw}@{host}:{port}/{db}",
-    connect_args={"allow_local_infile": True}
-)
-
-# ── 5. build tables (idempotent) ─────────────────────────────────
 ddl = """
 CREATE TABLE IF NOT EXISTS dim_date (
   date_id      INT PRIMARY KEY,
@@ -65,13 +38,33 @@ CREATE TABLE IF NOT EXISTS fact_macro (
   FOREIGN KEY (series_id) REFERENCES dim_series(series_id)
 );
 """
-with engine.begin() as conn:
-    for stmt in ddl.strip().split(";"):
-        if stmt.strip():
-            conn.execute(text(stmt))
-print("✔  Tables created or verified.")
 
-# ── 6. smoke-test query ──────────────────────────────────────────
-with engine.connect() as conn:
-    ver = conn.execute(text("SELECT VERSION();")).scalar_one()
-    print("Connected! MySQL version →", ver)
+def main():
+    # ── 1. connect to the *server*, no db name ───────────────────
+    engine_root = get_engine(with_db=False)
+
+    # ── 2. create the database if it doesn't exist ───────────────
+    with engine_root.begin() as conn:
+        conn.execute(text(
+            f"CREATE DATABASE IF NOT EXISTS {db} "
+            "CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;"
+        ))
+    print(f"✔  Database '{db}' ready.")
+
+    # ── 3. reconnect *into* the new db ───────────────────────────
+    engine = get_engine()
+
+    # ── 4. build tables (idempotent) ─────────────────────────────
+    with engine.begin() as conn:
+        for stmt in ddl.strip().split(";"):
+            if stmt.strip():
+                conn.execute(text(stmt))
+    print("✔  Tables created or verified.")
+
+    # ── 5. smoke-test query ──────────────────────────────────────
+    with engine.connect() as conn:
+        ver = conn.execute(text("SELECT VERSION();")).scalar_one()
+        print("Connected! MySQL version →", ver)
+
+if __name__ == "__main__":
+    main()
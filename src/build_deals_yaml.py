@@ -1,7 +1,11 @@
 # build_deals_yaml.py  –  auto-discover 8-K accession numbers
-import os, yaml, re
+import os, yaml
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from sec_api import QueryApi, ExtractorApi
+from http_cache import cached, stats_line
+from multi_match import MultiMatcher
 
 load_dotenv()
 SEC_KEY = os.getenv("SEC_API_KEY")
@@ -11,6 +15,10 @@ if not SEC_KEY:
 q  = QueryApi(SEC_KEY)
 ex = ExtractorApi(SEC_KEY)
 
+# on-disk cached SEC calls (see http_cache.py)
+get_filings = cached("sec", ttl=24 * 3600)(q.get_filings)
+get_section = cached("sec")(ex.get_section)
+
 # ---------- helper: historical ticker aliases ---------- #
 ticker_alias = {
     "META": ["META", "FB"],      # Facebook tickers
@@ -37,26 +45,43 @@ def variants(base):
     return keyword_variants.get(base, [base])
 
 # ---------- core search routine ---------- #
-def find_accession(keyword_base, buyer_ticker):
-    """Return accessionNo (str) or None."""
-    for tkr in ticker_alias.get(buyer_ticker, [buyer_ticker]):
-        # Pull up to 20 recent 8-Ks for that ticker
-        filings = q.get_filings({
-            "query": {"query_string": {"query": f'ticker:{tkr} AND formType:8-K'}},
-            "size": 20,
-            "sort": [{"filedAt": {"order": "desc"}}]
-        })
-
-        if not isinstance(filings, list):
-            continue  # rare empty dict edge-case
-
-        for f in filings:
-            url  = f["linkToFilingDetails"]
-            text = ex.get_section(url, "1", "text")  # Item 1 often lists the target
-            for kw in variants(keyword_base):
-                if re.search(re.escape(kw), text, re.I):
-                    return f["accessionNo"]   # bingo
-    return None
+FILINGS_PER_ALIAS = 20
+WORKERS = int(os.getenv("SEC_WORKERS", "8"))
+
+def recent_8ks(tkr):
+    """Up to FILINGS_PER_ALIAS recent 8-Ks for one ticker ([] on the empty-dict edge-case)."""
+    filings = get_filings({
+        "query": {"query_string": {"query": f'ticker:{tkr} AND formType:8-K'}},
+        "size": FILINGS_PER_ALIAS,
+        "sort": [{"filedAt": {"order": "desc"}}]
+    })
+    return filings if isinstance(filings, list) else []
+
+def item1_text(filing):
+    return get_section(filing["linkToFilingDetails"], "1", "text")  # Item 1 often lists the target
+
+def find_accessions(keyword_bases, buyer_ticker, pool):
+    """
+    {keyword_base: accessionNo or None} for every deal of one buyer.
+    The buyer's filings and Item 1 texts are fetched once (concurrently) and
+    each text is scanned in one pass for all keyword variants at once.
+    A deal gets the first filing that mentions it, in alias → filing order.
+    """
+    aliases = ticker_alias.get(buyer_ticker, [buyer_ticker])
+    filings, seen = [], set()
+    for batch in pool.map(recent_8ks, aliases):
+        for f in batch:
+            if f["accessionNo"] not in seen:
+                seen.add(f["accessionNo"])
+                filings.append(f)
+
+    matcher = MultiMatcher({kw: base for base in keyword_bases for kw in variants(base)})
+    found = dict.fromkeys(keyword_bases)
+    for f, text in zip(filings, pool.map(item1_text, filings)):
+        for base in matcher.find(text):
+            if found[base] is None:
+                found[base] = f["accessionNo"]   # bingo
+    return found
 
 # ---------- deal list (shortened for demo) ---------- #
 deals = [
@@ -74,17 +99,24 @@ deals = [
 ]
 
 # ---------- main loop ---------- #
+by_buyer = defaultdict(list)
 for d in deals:
     if d["ticker"].upper() == "PRIVATE":
         d["accession"] = None
-        continue
-
-    acc = find_accession(d["keyword"], d["ticker"])
-    if acc:
-        print(f"✓ {d['company']}: {acc}")
     else:
-        print(f"⚠️  No 8-K match for {d['company']}")
-    d["accession"] = acc
+        by_buyer[d["ticker"].upper()].append(d)
+
+with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+    for buyer, buyer_deals in by_buyer.items():
+        found = find_accessions({d["keyword"] for d in buyer_deals}, buyer, pool)
+        for d in buyer_deals:
+            acc = found[d["keyword"]]
+            if acc:
+                print(f"✓ {d['company']}: {acc}")
+            else:
+                print(f"⚠️  No 8-K match for {d['company']}")
+            d["accession"] = acc
 
 yaml.safe_dump(deals, open("deals.yaml", "w"))
 print("deals.yaml written.")
+print(stats_line())
@@ -1,19 +1,50 @@
 import yaml
 import csv
+import json
+import os
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime
-from pathlib import Path
+from urllib.parse import urlparse
 from data_helpers import (
     acquisition_price,
     extract_company_metrics,
     get_employee_data,
     calculate_valuation_metrics
 )
+from http_cache import stats_line
 
-# Configuration
+# Configuration (SEC responses are cached on disk in .cache/ by http_cache)
 INPUT_YAML = "deals.yaml"
 OUTPUT_CSV = "private_events.csv"
-CACHE_DIR = Path(".cache")
-CACHE_DIR.mkdir(exist_ok=True)
+CHECKPOINT = "private_events.checkpoint.jsonl"   # one finished deal per line
+SEC_HOST   = "sec-api.io"
+
+class HostLimits:
+    """Per-host semaphores so one slow site can't take every worker."""
+    def __init__(self, per_host=4, overrides=None):
+        self.per_host  = per_host
+        self.overrides = overrides or {}
+        self._sems = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def __call__(self, host):
+        with self._lock:
+            sem = self._sems.get(host)
+            if sem is None:
+                sem = threading.BoundedSemaphore(self.overrides.get(host, self.per_host))
+                self._sems[host] = sem
+        with sem:
+            yield
+
+# shared by the worker threads; main() sizes it from the CLI flags
+limits = HostLimits()
+
+def deal_key(deal):
+    return f"{deal['company']}|{deal.get('accession') or deal.get('article_url')}"
 
 def load_deals_with_fallback(yaml_path):
     """Load deals with validation and defaults"""
@@ -30,8 +61,13 @@ def load_deals_with_fallback(yaml_path):
     
     return entries
 
+def article_metrics(url):
+    with limits(urlparse(url).netloc or url):
+        return extract_company_metrics(url)
+
 def process_deal(deal):
     """Enhanced processing pipeline for each deal"""
+    article_data = None
     metrics = {
         "company": deal["company"],
         "ticker": deal.get("ticker"),
@@ -42,11 +78,12 @@ def process_deal(deal):
     try:
         # Get valuation (multiple fallbacks)
         if deal.get("accession"):
-            metrics["valuation_usd"] = acquisition_price(deal["accession"])
+            with limits(SEC_HOST):
+                metrics["valuation_usd"] = acquisition_price(deal["accession"])
         elif "valuation" in deal:
             metrics["valuation_usd"] = deal["valuation"]
         else:
-            article_data = extract_company_metrics(deal["article_url"])
+            article_data = article_metrics(deal["article_url"])
             metrics["valuation_usd"] = article_data.get("valuation")
         
         # Get employee count (multiple sources)
@@ -54,10 +91,11 @@ def process_deal(deal):
             metrics["employees"] = deal["employee_count"]
         else:
             if deal.get("ticker") and deal["ticker"] != "Private":
-                emp_data = get_employee_data(deal["ticker"])
+                with limits(SEC_HOST):
+                    emp_data = get_employee_data(deal["ticker"])
                 metrics["employees"] = emp_data["count"] if emp_data else None
             else:
-                article_data = article_data or extract_company_metrics(deal["article_url"])
+                article_data = article_data or article_metrics(deal["article_url"])
                 metrics["employees"] = article_data.get("employees")
         
         # Calculate derived metrics
@@ -80,6 +118,25 @@ def process_deal(deal):
             "extraction_time": datetime.utcnow().isoformat()
         }
 
+def load_checkpoint(path):
+    """{deal key: record} from a checkpoint file; the last line per deal wins."""
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue                      # torn last line from a crash
+            done[rec["deal_key"]] = rec
+    return done
+
+def append_checkpoint(fh, key, result):
+    fh.write(json.dumps({"deal_key": key, **result}, default=str) + "\n")
+    fh.flush()
+    os.fsync(fh.fileno())
+
 def write_output(results, csv_path):
     """Write results with dynamic columns"""
     fieldnames = set()
@@ -92,22 +149,51 @@ def write_output(results, csv_path):
         writer.writeheader()
         writer.writerows(results)
 
-def main():
-    entries = load_deals_with_fallback(INPUT_YAML)
-    results = []
-    
-    for deal in entries:
-        print(f"\nProcessing {deal['company']}...")
-        result = process_deal(deal)
-        results.append(result)
-        
-        # Print summary
-        val = result.get("valuation_usd", "N/A")
-        emp = result.get("employees", "N/A")
-        print(f"{deal['company']:20s} | Val: ${val:,} | Emp: {emp} | Status: {'Success' if 'error' not in result else 'Failed'}")
+def print_summary(company, result):
+    val = result.get("valuation_usd")
+    emp = result.get("employees", "N/A")
+    val = f"${val:,}" if isinstance(val, (int, float)) else "N/A"
+    print(f"{company:20s} | Val: {val} | Emp: {emp} | Status: {'Success' if 'error' not in result else 'Failed'}")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Build private_events.csv from deals.yaml")
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--per-host", type=int, default=4, help="concurrent requests per host")
+    ap.add_argument("--sec-limit", type=int, default=None, help="override for sec-api.io")
+    ap.add_argument("--input", default=INPUT_YAML)
+    ap.add_argument("--output", default=OUTPUT_CSV)
+    ap.add_argument("--checkpoint", default=CHECKPOINT)
+    ap.add_argument("--fresh", action="store_true", help="ignore the checkpoint and redo every deal")
+    args = ap.parse_args(argv)
+
+    limits.per_host = args.per_host
+    if args.sec_limit:
+        limits.overrides[SEC_HOST] = args.sec_limit
+
+    entries = load_deals_with_fallback(args.input)
+    if args.fresh and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    done = load_checkpoint(args.checkpoint)
+    todo = [d for d in entries if "error" in done.get(deal_key(d), {"error": "pending"})]
+    print(f"➤ {len(entries) - len(todo)} deals already in checkpoint, {len(todo)} to process")
+
+    with open(args.checkpoint, "a") as ckpt, \
+         ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = {pool.submit(process_deal, d): d for d in todo}
+        for fut in as_completed(futures):
+            deal, result = futures[fut], fut.result()
+            key = deal_key(deal)
+            append_checkpoint(ckpt, key, result)
+            done[key] = {"deal_key": key, **result}
+            print_summary(deal["company"], result)
 
-    write_output(results, OUTPUT_CSV)
-    print(f"\nOutput written to {OUTPUT_CSV} with {len(results)} records")
+    # final CSV in deals.yaml order, straight from the checkpoint records
+    results = [{k: v for k, v in done[deal_key(d)].items() if k != "deal_key"}
+               for d in entries if deal_key(d) in done]
+    write_output(results, args.output)
+    failed = sum("error" in r for r in results)
+    print(f"\nOutput written to {args.output} with {len(results)} records ({failed} failed)")
+    print(stats_line())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
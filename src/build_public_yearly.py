@@ -1,24 +1,18 @@
-import pandas as pd, yfinance as yf
+from public_snapshots import collect, append_snapshots, yfinance_quote
+from http_cache import stats_line
 
 TICKERS = ["NVDA", "AAPL", "MSFT", "META", "GOOGL", "AMZN"]
-rows    = []
 
-for t in TICKERS:
-    yf_t = yf.Ticker(t)
+# fetched concurrently; each ticker costs one get_info() (cached on disk for a day)
+snap, errors = collect(TICKERS, yfinance_quote)
+missing = sorted(set(errors) | set(snap.loc[snap["market_cap"].isna(), "ticker"]))
+if missing:
+    raise ValueError(f"marketCap missing for {', '.join(missing)}")
 
-    # 1) Market-cap  – robust field path
-    mc = (yf_t.fast_info.get("marketCap")            # yfinance ≥0.2.37
-          or yf_t.get_info().get("marketCap")        # legacy field
-          or yf_t.basic_info.get("marketCap"))       # new fallback
-    if mc is None:
-        raise ValueError(f"marketCap missing for {t}")
+for r in snap.itertuples():
+    print(f"{r.ticker:<5}  mc=${r.market_cap:,.0f}  emp={r.employees}")
 
-    # 2) Employees  – Yahoo always stores fullTimeEmployees
-    emp = (yf_t.fast_info.get("lastFullTimeEmployees")
-           or yf_t.get_info().get("fullTimeEmployees"))
-
-    rows.append({"ticker": t, "market_cap": mc, "employees": emp})
-    print(f"{t:<5}  mc=${mc:,.0f}  emp={emp}")
-
-pd.DataFrame(rows).to_csv("public_yearly.csv", index=False)
+append_snapshots(snap)
+snap[["ticker", "market_cap", "employees"]].to_csv("public_yearly.csv", index=False)
 print("\n✅ public_yearly.csv written (look in project folder)")
+print(stats_line())
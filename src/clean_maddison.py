@@ -1,5 +1,6 @@
 import pandas as pd
 import os
+from maddison_store import write_store, STORE_DIR
 
 # Load the sheet with GDP per capita in 2011 USD prices
 xls = pd.ExcelFile('data/raw/maddison/mpd2023_web.xlsx')
@@ -21,4 +22,7 @@ df_melted.dropna(inplace=True)
 os.makedirs("data/processed", exist_ok=True)
 df_melted.to_csv("data/processed/maddison_gdp.csv", index=False)
 
-print(" GDP per capita data cleaned and saved.")
+# Country-partitioned Parquet store for the chart scripts (see maddison_store.py)
+n = write_store(df_melted)
+
+print(f" GDP per capita data cleaned and saved ({n} countries in {STORE_DIR}).")
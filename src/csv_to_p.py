@@ -1,26 +1,47 @@
 # src/csv_to_parquet.py
 """
 Convert *all* your FRED CSVs—both in data/raw/fred/ and data/processed/fred/—
-into full-history Parquet files under data/clean/.
+into one full-history long-format store, data/clean/series_store.parquet
+(see series_store.py).
+
+Pass --per-series to also write the old one-file-per-series
+data/clean/fred_<CODE>.parquet files (the notebook still reads those).
 """
-import os, glob
+import os, sys, glob
 import pandas as pd
+from series_store import to_long, write_store, STORE_PATH
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    # Ensure the clean folder exists
+    os.makedirs("data/clean", exist_ok=True)
+
+    # Collect CSVs from both locations
+    csv_paths = (
+        glob.glob("data/raw/fred/*.csv") +
+        glob.glob("data/processed/fred/*.csv")
+    )
 
-# Ensure the clean folder exists
-os.makedirs("data/clean", exist_ok=True)
+    parts = []
+    for csv_path in csv_paths:
+        code = os.path.basename(csv_path).replace(".csv", "")
+        print(f"Converting {code} → Parquet")
+        # Read the full history, parsing the 'date' column
+        df = pd.read_csv(csv_path, parse_dates=['date'])
+        parts.append(to_long(code, df))
+        if "--per-series" in argv:
+            df.to_parquet(f"data/clean/fred_{code}.parquet", index=False)
 
-# Collect CSVs from both locations
-csv_paths = (
-    glob.glob("data/raw/fred/*.csv") +
-    glob.glob("data/processed/fred/*.csv")
-)
+    if not parts:
+        raise SystemExit("❌ No FRED CSVs in data/raw/fred/ or data/processed/fred/; "
+                         f"{STORE_PATH} left unchanged.")
 
-for csv_path in csv_paths:
-    code = os.path.basename(csv_path).replace(".csv", "")
-    print(f"Converting {code} → Parquet")
-    # Read the full history, parsing the 'date' column
-    df = pd.read_csv(csv_path, parse_dates=['date'])
-    # Write every row out to clean/
-    df.to_parquet(f"data/clean/fred_{code}.parquet", index=False)
+    # a code in both folders: the processed copy (read last) wins
+    long_df = pd.concat(parts, ignore_index=True)
+    long_df = long_df.drop_duplicates(["series_id", "date"], keep="last")
+    n = write_store(long_df, STORE_PATH)
+    print(f"✅ {n} FRED series written to {STORE_PATH}.")
 
-print("✅ All FRED CSVs converted to full-history Parquets.")
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 import os, re
-from functools import lru_cache
 from dotenv import load_dotenv
 from sec_api import QueryApi, ExtractorApi
+from http_cache import cached
 
 # ── SEC config ─────────────────────────────────────────────
 load_dotenv()
@@ -12,8 +12,11 @@ if not SEC_KEY:
 q  = QueryApi(SEC_KEY)
 ex = ExtractorApi(SEC_KEY)
 
-# ── cached Item-1 text fetch ───────────────────────────────
-@lru_cache(maxsize=128)
+# "latest 10-K" answers can change, so re-ask daily; filing texts never do
+latest_filings = cached("sec", ttl=24 * 3600)(q.get_filings)
+
+# ── cached Item-1 text fetch (on disk, survives restarts) ──
+@cached("sec")
 def _item1_text(accession):
     hit = q.get_filings({
         "query": {"query_string": {"query": f"accessionNumber:{accession}"}},
@@ -27,7 +30,7 @@ def _item1_text(accession):
 # ── public-company employee count (latest 10-K) ────────────
 def get_employee_count(ticker: str) -> int | None:
     """Return latest employee count from any 10-K variant."""
-    hits = q.get_filings({
+    hits = latest_filings({
         "query": {"query_string": {
             # match 10-K, 10-K/A, 10-K405, etc.
             "query": f'ticker:{ticker} AND formType:10-K*'
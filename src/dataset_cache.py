@@ -0,0 +1,102 @@
+# src/dataset_cache.py
+"""
+In-process dataset cache for the analysis scripts and eda.ipynb.
+
+load(path) parses a CSV/Parquet file once and memoizes the frame under
+(path, mtime, size, reader arguments). Editing or regenerating the file
+changes its mtime, so the next load() re-reads it and drops the stale
+entry; otherwise repeated loads cost one stat().
+
+Callers get a shallow copy of the cached frame. pandas' copy-on-write
+makes that copy read-only with respect to the cache: adding columns,
+dropping rows or assigning values only changes the caller's copy. (On
+pandas < 3 without copy-on-write, a deep copy is returned instead.)
+
+The cache holds at most DATASET_CACHE_MAX_MB (default 512) of frames, by
+deep memory usage, and evicts the least recently used first.
+
+  from dataset_cache import load, stats_line
+  df = load("data/processed/wide_panel.parquet")
+  print(stats_line())
+"""
+import os, threading
+from collections import OrderedDict
+import pandas as pd
+
+MAX_BYTES = int(float(os.getenv("DATASET_CACHE_MAX_MB", "512")) * 1024 * 1024)
+
+READERS = {".csv": pd.read_csv, ".parquet": pd.read_parquet}
+
+_COW   = int(pd.__version__.split(".")[0]) >= 3     # always on from pandas 3
+_lock  = threading.Lock()
+_cache = OrderedDict()        # key → (frame, nbytes), oldest first
+_bytes = 0
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+def _key(path, kwargs):
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size,
+            tuple(sorted((k, repr(v)) for k, v in kwargs.items())))
+
+def _drop(key):
+    global _bytes
+    _, nbytes = _cache.pop(key)
+    _bytes -= nbytes
+
+def _view(df):
+    return df.copy(deep=not _COW)
+
+def set_max_mb(mb):
+    """Change the memory cap at runtime (evicts immediately if needed)."""
+    global MAX_BYTES
+    with _lock:
+        MAX_BYTES = int(mb * 1024 * 1024)
+        _evict()
+
+def _evict():
+    while _cache and _bytes > MAX_BYTES:
+        _drop(next(iter(_cache)))
+        _stats["evictions"] += 1
+
+def load(path, **kwargs):
+    """Frame for a .csv/.parquet file, parsed at most once per file version."""
+    global _bytes
+    key = _key(path, kwargs)
+    with _lock:
+        hit = _cache.get(key)
+        if hit is not None:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return _view(hit[0])
+        _stats["misses"] += 1
+
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in READERS:
+        raise ValueError(f"no reader for {ext!r} files: {path}")
+    df = READERS[ext](path, **kwargs)
+    nbytes = int(df.memory_usage(deep=True).sum())
+
+    with _lock:
+        # older versions of the same file can never be hit again
+        for stale in [k for k in _cache if k[0] == key[0] and k != key]:
+            _drop(stale)
+        if key not in _cache and nbytes <= MAX_BYTES:
+            _cache[key] = (df, nbytes)
+            _bytes += nbytes
+            _evict()
+    return _view(df)
+
+def stats():
+    with _lock:
+        return {**_stats, "entries": len(_cache), "mb": round(_bytes / 1024 / 1024, 2)}
+
+def stats_line():
+    s = stats()
+    return (f"🗃  dataset cache — {s['hits']} hit / {s['misses']} miss, "
+            f"{s['entries']} frames, {s['mb']} MB, {s['evictions']} evicted")
+
+def clear():
+    global _bytes
+    with _lock:
+        _cache.clear()
+        _bytes = 0
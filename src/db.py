@@ -0,0 +1,43 @@
+# src/db.py
+"""
+One place to build the SQLAlchemy engine for econ_panel.
+
+Every script used to assemble its own URL from .env and call create_engine,
+paying a fresh MySQL handshake each time. get_engine() reads the MYSQL_*
+variables once and hands back a single pooled engine (pre-ping on, idle
+connections recycled), so stages run in the same process share warm
+connections.
+
+Pool knobs (all optional, in .env):
+  MYSQL_POOL_SIZE     connections kept open          (default 5)
+  MYSQL_MAX_OVERFLOW  extra connections under burst  (default 10)
+  MYSQL_POOL_RECYCLE  seconds before a reconnect     (default 1800)
+"""
+import os
+from functools import lru_cache
+from sqlalchemy import create_engine
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def db_url(with_db=True):
+    """mysql+mysqlconnector URL from .env; with_db=False targets the server only."""
+    user = os.getenv("MYSQL_USER", "root")
+    pw   = os.getenv("MYSQL_PW",   "")
+    host = os.getenv("MYSQL_HOST", "localhost")
+    port = os.getenv("MYSQL_PORT", "3306")
+    db   = os.getenv("MYSQL_DB",   "econ_panel")
+    return f"mysql+mysqlconnector://{user}:{pw}@{host}:{port}/{db if with_db else ''}"
+
+@lru_cache(maxsize=None)
+def get_engine(with_db=True, echo=False):
+    """Shared pooled engine; repeated calls return the same object."""
+    return create_engine(
+        db_url(with_db),
+        echo=echo,                        # turn to True if you want SQL logs
+        pool_size=int(os.getenv("MYSQL_POOL_SIZE", "5")),
+        max_overflow=int(os.getenv("MYSQL_MAX_OVERFLOW", "10")),
+        pool_recycle=int(os.getenv("MYSQL_POOL_RECYCLE", "1800")),
+        pool_pre_ping=True,
+        connect_args={"allow_local_infile": True},
+    )
@@ -0,0 +1,51 @@
+# src/fake_fred_server.py
+"""
+Local stand-in for the FRED observations endpoint, for exercising
+fred_async.py without an API key or network.
+
+Serves GET /fred/series/observations?series_id=X[&observation_start=YYYY-MM-DD]
+from <source-dir>/<X>.csv (default data/raw/fred) in FRED's JSON shape.
+--fail-rate makes that fraction of requests answer 429 to exercise retries.
+
+  python src/fake_fred_server.py --port 8089 --fail-rate 0.2
+"""
+import argparse, csv, os, random
+from aiohttp import web
+
+def make_app(source_dir="data/raw/fred", fail_rate=0.0, seed=None):
+    rng = random.Random(seed)
+    app = web.Application()
+    app["hits"] = 0
+
+    async def observations(request):
+        app["hits"] += 1
+        if rng.random() < fail_rate:
+            return web.json_response({"error_message": "Too Many Requests"}, status=429)
+
+        code  = request.query.get("series_id", "")
+        start = request.query.get("observation_start", "")
+        path  = os.path.join(source_dir, f"{os.path.basename(code)}.csv")
+        if not code or not os.path.exists(path):
+            return web.json_response(
+                {"error_code": 400, "error_message": "Bad Request. The series does not exist."},
+                status=400)
+
+        with open(path, newline="") as fh:
+            rows = list(csv.reader(fh))[1:]
+        obs = [{"date": d, "value": v if v != "" else "."}
+               for d, v in rows if d >= start]
+        return web.json_response({"count": len(obs), "observations": obs})
+
+    app.router.add_get("/fred/series/observations", observations)
+    return app
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Fake FRED HTTP server")
+    ap.add_argument("--port", type=int, default=8089)
+    ap.add_argument("--source-dir", default="data/raw/fred")
+    ap.add_argument("--fail-rate", type=float, default=0.0)
+    args = ap.parse_args(argv)
+    web.run_app(make_app(args.source_dir, args.fail_rate), port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,12 @@ import os
 from dotenv import load_dotenv
 import pandas as pd
 from fredapi import Fred
+from vintage_store import record_vintage
+from http_cache import cached, stats_line
 
 load_dotenv()
 FRED_API_KEY = os.getenv("FRED_API_KEY")
 
-fred = Fred(api_key=FRED_API_KEY)
-
 # Sample economic indicators (feel free to add more)
 indicators = {
     "GDP": "GDPC1",                         # US Gross Domestic Product
@@ -43,26 +43,41 @@ indicators = {
 """
 
 output_dir = "data/raw/fred/"
-os.makedirs(output_dir, exist_ok=True)
 
-for name, code in indicators.items():
-    print(f"Fetching {name} ({code})...")
-    
-    try:
-        series = fred.get_series(code)
-        df = series.reset_index()
-        df.columns = ['date', code]
+def main():
+    fred = Fred(api_key=FRED_API_KEY)
+    get_series = cached("fred")(fred.get_series)
+    os.makedirs(output_dir, exist_ok=True)
+
+    for name, code in indicators.items():
+        print(f"Fetching {name} ({code})...")
+
+        try:
+            series = get_series(code)
+            df = series.reset_index()
+            df.columns = ['date', code]
+
+            # Print start and end date of the data
+            start_date = df['date'].min()
+            end_date = df['date'].max()
+            print(f"  ➤ Date range: {start_date.date()} to {end_date.date()}")
+
+            # Keep only what changed since the last fetch in the vintage store
+            changed = record_vintage(code, df)
+            if changed == 0 and os.path.exists(f"{output_dir}{code}.csv"):
+                print(f"  ➤ No revisions for {name}; {output_dir}{code}.csv left as is\n")
+                continue
+            print(f"  ➤ {changed} new or revised observations")
 
-        # Print start and end date of the data
-        start_date = df['date'].min()
-        end_date = df['date'].max()
-        print(f"  ➤ Date range: {start_date.date()} to {end_date.date()}")
+            # Save to CSV
+            df.to_csv(f"{output_dir}{code}.csv", index=False)
+            print(f"  ➤ Saved {name} to {output_dir}{code}.csv\n")
 
-        # Save to CSV
-        df.to_csv(f"{output_dir}{code}.csv", index=False)
-        print(f"  ➤ Saved {name} to {output_dir}{code}.csv\n")
+        except Exception as e:
+            print(f"❌ Error fetching {name} ({code}): {e}\n")
 
-    except Exception as e:
-        print(f"❌ Error fetching {name} ({code}): {e}\n")
+    print("✅ Done fetching FRED data.")
+    print(stats_line())
 
-print("✅ Done fetching FRED data.")
+if __name__ == "__main__":
+    main()
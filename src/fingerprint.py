@@ -0,0 +1,57 @@
+# src/fingerprint.py
+"""
+Content fingerprints for pipeline inputs.
+
+file_digest() hashes a file's bytes (BLAKE2b), but first checks a stat
+cache of {path: [size, mtime_ns, digest]}; a file whose size and mtime
+are unchanged is not re-read. That keeps a no-op pipeline run to a
+handful of stat() calls.
+"""
+import hashlib, json, os
+from pathlib import Path
+
+CHUNK = 1 << 20
+
+def file_digest(path, stat_cache=None):
+    """Hex digest of the file's contents, memoised on (size, mtime_ns)."""
+    path = str(path)
+    st = os.stat(path)
+    if stat_cache is not None:
+        hit = stat_cache.get(path)
+        if hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+            return hit[2]
+
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(CHUNK), b""):
+            h.update(block)
+    digest = h.hexdigest()
+
+    if stat_cache is not None:
+        stat_cache[path] = [st.st_size, st.st_mtime_ns, digest]
+    return digest
+
+def combine(parts):
+    """One digest for an ordered iterable of strings."""
+    h = hashlib.blake2b(digest_size=16)
+    for p in parts:
+        h.update(p.encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+def load_state(path):
+    path = Path(path)
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except ValueError:
+        return {}       # corrupt state just means "rebuild everything"
+
+def save_state(path, state):
+    """Write state JSON atomically so a crash never leaves half a file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(state, indent=1, sort_keys=True))
+    os.replace(tmp, path)
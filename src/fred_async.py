@@ -0,0 +1,151 @@
+# src/fred_async.py
+"""
+Concurrent, incremental FRED fetcher.
+
+For every code it asks FRED only for observations after the last date
+already in data/raw/fred/<code>.csv and appends them as soon as that
+series' response arrives. Requests go through a semaphore (bounded
+concurrency) and a rate limiter that stays under FRED's published limit
+of 120 requests per minute; 429s, 5xx and connection errors are retried
+with exponential backoff.
+
+The API root is pluggable (FRED_BASE_URL in .env or --base-url), so the
+fetcher can be pointed at fake_fred_server.py for local runs:
+
+  python src/fake_fred_server.py --port 8089 &
+  python src/fred_async.py --base-url http://localhost:8089/fred
+"""
+import argparse, asyncio, os, random, time
+import aiohttp
+from dotenv import load_dotenv
+
+from fetch_fred_data import indicators, output_dir
+
+load_dotenv()
+FRED_API_KEY  = os.getenv("FRED_API_KEY", "")
+FRED_BASE_URL = os.getenv("FRED_BASE_URL", "https://api.stlouisfed.org/fred")
+
+RATE_PER_MIN = 120          # FRED's documented per-key limit
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+class RateLimiter:
+    """Spaces request starts at least 60/rate_per_min seconds apart."""
+    def __init__(self, rate_per_min=RATE_PER_MIN):
+        self.interval = 60.0 / rate_per_min
+        self.next_at  = 0.0
+        self.lock     = asyncio.Lock()
+
+    async def wait(self):
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_at - now
+            self.next_at = max(now, self.next_at) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+def last_stored_date(path):
+    """Date string on the last line of a date-first CSV, or None."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as fh:
+        fh.seek(0, os.SEEK_END)
+        fh.seek(max(0, fh.tell() - 4096))
+        lines = fh.read().decode().strip().splitlines()
+    last = lines[-1].split(",")[0] if lines else "date"
+    return None if last == "date" else last      # header only → full history
+
+def append_observations(path, code, observations, after=None):
+    """Append (date, value) rows newer than `after`; write the header for new files."""
+    rows = [(o["date"], "" if o["value"] == "." else o["value"])
+            for o in observations if after is None or o["date"] > after]
+    if not rows:
+        return 0
+    new_file = not os.path.exists(path)
+    with open(path, "a") as fh:
+        if new_file:
+            fh.write(f"date,{code}\n")
+        fh.writelines(f"{d},{v}\n" for d, v in rows)
+    return len(rows)
+
+async def fetch_observations(session, code, start, base_url, api_key,
+                             limiter, sem, retries=5):
+    params = {"series_id": code, "api_key": api_key, "file_type": "json"}
+    if start:
+        params["observation_start"] = start
+    url = f"{base_url.rstrip('/')}/series/observations"
+
+    for attempt in range(retries + 1):
+        await limiter.wait()
+        try:
+            async with sem, session.get(url, params=params) as resp:
+                if resp.status in RETRY_STATUS:
+                    raise aiohttp.ClientResponseError(
+                        resp.request_info, resp.history, status=resp.status)
+                resp.raise_for_status()
+                return (await resp.json())["observations"]
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            status = getattr(e, "status", None)
+            if attempt == retries or (status and status not in RETRY_STATUS):
+                raise
+            backoff = min(60.0, 2 ** attempt) * (0.5 + random.random())
+            print(f"  ↻ {code}: {status or type(e).__name__}, retry in {backoff:.1f}s")
+            await asyncio.sleep(backoff)
+
+def describe_error(e):
+    """Loggable summary of a fetch error. aiohttp's str(e) includes the request
+    URL, whose query string carries api_key, so only status and type are shown."""
+    if isinstance(e, aiohttp.ClientResponseError):
+        return f"HTTP {e.status} {e.message or ''}".strip()
+    if isinstance(e, aiohttp.ClientError):
+        return type(e).__name__
+    return f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+
+async def fetch_one(session, code, out_dir, base_url, api_key, limiter, sem):
+    """(code, rows appended) — or (code, exception) so one failure doesn't stop the rest."""
+    path  = os.path.join(out_dir, f"{code}.csv")
+    after = last_stored_date(path)
+    try:
+        obs = await fetch_observations(session, code, after, base_url, api_key, limiter, sem)
+    except Exception as e:
+        return code, e
+    return code, append_observations(path, code, obs, after)
+
+async def fetch_all(codes, out_dir=output_dir, base_url=FRED_BASE_URL,
+                    api_key=FRED_API_KEY, concurrency=8, rate_per_min=RATE_PER_MIN,
+                    timeout=30):
+    """Fetch every code; returns {code: rows appended, or the exception}."""
+    os.makedirs(out_dir, exist_ok=True)
+    limiter = RateLimiter(rate_per_min)
+    sem = asyncio.Semaphore(concurrency)
+    results = {}
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+        tasks = [fetch_one(session, c, out_dir, base_url, api_key, limiter, sem)
+                 for c in codes]
+        for fut in asyncio.as_completed(tasks):
+            code, result = await fut
+            results[code] = result
+            if isinstance(result, Exception):
+                print(f"❌ Error fetching {code}: {describe_error(result)}")
+            else:
+                print(f"  ➤ {code}: {result} new observations")
+    return results
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Incremental async FRED fetch")
+    ap.add_argument("codes", nargs="*", help="FRED codes (default: fetch_fred_data.indicators)")
+    ap.add_argument("--base-url", default=FRED_BASE_URL)
+    ap.add_argument("--out-dir", default=output_dir)
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--rate", type=float, default=RATE_PER_MIN, help="requests per minute")
+    args = ap.parse_args(argv)
+
+    codes = args.codes or list(indicators.values())
+    t0 = time.perf_counter()
+    results = asyncio.run(fetch_all(codes, args.out_dir, args.base_url, FRED_API_KEY,
+                                    args.concurrency, args.rate))
+    failed = [c for c, r in results.items() if isinstance(r, Exception)]
+    print(f"✅ Done: {len(codes) - len(failed)} series up to date in "
+          f"{time.perf_counter() - t0:.1f}s" + (f", failed: {failed}" if failed else ""))
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,13 @@
-import pandas as pd
 import matplotlib.pyplot as plt
+from maddison_store import read_maddison
+from dataset_cache import load
 
-# Load GDP data
-gdp = pd.read_csv('data/processed/maddison/maddison_gdp.csv')
-
-# Filtered to show GDP for the US specifically
-gdp = gdp[gdp['country'] == 'United States']
+# Load GDP data for the US only (reads just that country's partition)
+gdp = read_maddison(["United States"])
 gdp.rename(columns={'gdp_pc_2011usd': 'GDP'}, inplace=True)
 
 # Load tech breakthrough timeline
-tech = pd.read_csv('src/tech_timeline.csv')
+tech = load('src/tech_timeline.csv')
 
 # Filters tech events to only match GDP years
 tech = tech[(tech['year'] >= gdp['year'].min()) & (tech['year'] <= gdp['year'].max())]
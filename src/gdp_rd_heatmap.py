@@ -1,19 +1,22 @@
+import sys
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
+from maddison_store import read_maddison
+from dataset_cache import load
+from event_study import event_window, load_tech_events, window_frame
 
 # --- Load GDP Data ---
-gdp = pd.read_csv('data/processed/maddison_gdp.csv')
-gdp = gdp[gdp['country'] == 'United States'].copy()
+gdp = read_maddison(["United States"])
 gdp.rename(columns={'gdp_pc_2011usd': 'GDP'}, inplace=True)
 gdp['GDP_growth'] = gdp['GDP'].pct_change() * 100
 gdp['year'] = gdp['year'].astype(int)
 
 # --- Load R&D Data ---
-private_rd = pd.read_csv('data/processed/Y006RC1Q027SBEA_normalized.csv')
+private_rd = load('data/processed/Y006RC1Q027SBEA_normalized.csv')
 private_rd['year'] = pd.to_datetime(private_rd['date']).dt.year
 
-gov_rd = pd.read_csv('data/processed/Y057RC1Q027SBEA_normalized.csv')
+gov_rd = load('data/processed/Y057RC1Q027SBEA_normalized.csv')
 gov_rd['year'] = pd.to_datetime(gov_rd['date']).dt.year
 
 # --- Merge GDP + Private R&D + Gov R&D ---
@@ -21,43 +24,36 @@ merged = gdp.merge(private_rd[['year', 'Private_RD_real']], on='year', how='left
 merged = merged.merge(gov_rd[['year', 'Gov_RD_real']], on='year', how='left')
 
 # --- Load Tech Timeline ---
-tech = pd.read_csv('src/tech_timeline.csv')
-tech = tech[(tech['year'] >= merged['year'].min()) & (tech['year'] <= merged['year'].max())]
+tech = load_tech_events()
+tech = tech[(tech['time'] >= merged['year'].min()) & (tech['time'] <= merged['year'].max())]
 
-# --- Build Before/During/After Table ---
-records = []
-
-for _, row in tech.iterrows():
-    y = row['year']
-    tech_name = row['technology']
-
-    for offset, label in zip([-1, 0, 1], ['Before', 'During', 'After']):
-        year = y + offset
-        data = merged[merged['year'] == year]
-
-        if not data.empty:
-            records.append({
-                'Technology': tech_name,
-                'Period': label,
-                'Year': year,
-                'GDP_growth': data['GDP_growth'].values[0],
-                'Private_RD': data['Private_RD_real'].values[0],
-                'Gov_RD': data['Gov_RD_real'].values[0]
-            })
-
-df = pd.DataFrame(records)
+# --- Build Before/During/After Table (one gather, see event_study.py) ---
+# R&D is quarterly, so the merge repeats each year; use its first row as before
+yearly = merged.drop_duplicates('year')
+res = event_window(yearly, tech, ['GDP_growth', 'Private_RD_real', 'Gov_RD_real'], window=1)
+periods = {-1: 'Before', 0: 'During', 1: 'After'}
 
 # --- Create Pivot Tables ---
-gdp_pivot = df.pivot(index='Technology', columns='Period', values='GDP_growth')
-private_pivot = df.pivot(index='Technology', columns='Period', values='Private_RD')
-gov_pivot = df.pivot(index='Technology', columns='Period', values='Gov_RD')
+gdp_pivot = window_frame(res, 'GDP_growth', periods)
+private_pivot = window_frame(res, 'Private_RD_real', periods)
+gov_pivot = window_frame(res, 'Gov_RD_real', periods)
+for pivot in (gdp_pivot, private_pivot, gov_pivot):
+    pivot.index.name, pivot.columns.name = 'Technology', 'Period'
 
 # --- Reorder technologies chronologically ---
-tech_order = tech.sort_values('year')['technology']
+tech_order = tech.sort_values('time')['event']
 gdp_pivot = gdp_pivot.loc[tech_order]
 private_pivot = private_pivot.loc[tech_order]
 gov_pivot = gov_pivot.loc[tech_order]
 
+# --- Optional: placebo-date significance of During - Before (event_bootstrap.py) ---
+if '--bootstrap' in sys.argv:
+    from event_bootstrap import event_significance
+    # workers=1: this script has no __main__ guard, so a spawned pool would re-run it
+    sig = event_significance(yearly, tech, ['GDP_growth', 'Private_RD_real', 'Gov_RD_real'],
+                             workers=1)
+    print(sig.round(3).to_string(index=False))
+
 # --- Plot Side-by-Side Heatmaps ---
 fig, axes = plt.subplots(1, 3, figsize=(22, 8))
 
@@ -0,0 +1,160 @@
+# src/http_cache.py
+"""
+Persistent on-disk cache for the SEC, FRED and yfinance client calls.
+
+Responses are pickled into one SQLite file (.cache/http_cache.sqlite),
+keyed by source + function name + call arguments, so a rerun of the deal
+or employee pipelines is answered from disk. Each source has its own TTL,
+and once the file grows past HTTP_CACHE_MAX_MB (default 256) the least
+recently used entries are evicted. The cache's total size is kept in a
+one-row meta table updated in the same transaction as every write, so
+checking it is a single-row read however large the cache gets. Hit/miss
+counters are kept per source.
+
+  from http_cache import cached
+  get_filings = cached("sec")(q.get_filings)
+"""
+import functools, hashlib, json, os, pickle, sqlite3, threading, time
+from collections import defaultdict
+
+CACHE_DIR  = ".cache"
+CACHE_PATH = os.path.join(CACHE_DIR, "http_cache.sqlite")
+MAX_BYTES  = int(float(os.getenv("HTTP_CACHE_MAX_MB", "256")) * 1024 * 1024)
+
+# seconds; filings never change, quotes and series refresh daily
+TTL = {
+    "sec":      30 * 24 * 3600,
+    "fred":     12 * 3600,
+    "yfinance": 24 * 3600,
+}
+
+_local = threading.local()
+_lock  = threading.Lock()
+_stats = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+def _conn():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        conn = sqlite3.connect(CACHE_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+              key         TEXT PRIMARY KEY,
+              source      TEXT NOT NULL,
+              created_at  REAL NOT NULL,
+              accessed_at REAL NOT NULL,
+              size        INTEGER NOT NULL,
+              payload     BLOB NOT NULL
+            )""")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON responses(accessed_at)")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v INTEGER NOT NULL)")
+        with conn:                        # caches from before the meta table: sum once
+            if conn.execute("SELECT 1 FROM meta WHERE k = 'total_bytes'").fetchone() is None:
+                conn.execute("INSERT INTO meta SELECT 'total_bytes', COALESCE(SUM(size), 0) "
+                             "FROM responses")
+        _local.conn = conn
+    return conn
+
+def make_key(source, name, args, kwargs):
+    raw = json.dumps([source, name, args, kwargs], sort_keys=True, default=repr)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+def get(source, key, ttl=None):
+    """(True, value) on a fresh hit, (False, None) otherwise."""
+    ttl = TTL.get(source, 24 * 3600) if ttl is None else ttl
+    conn = _conn()
+    row = conn.execute("SELECT created_at, payload FROM responses WHERE key = ?",
+                       (key,)).fetchone()
+    now = time.time()
+    with _lock:
+        if row is None or now - row[0] > ttl:
+            _stats[source]["misses"] += 1
+            return False, None
+        _stats[source]["hits"] += 1
+    conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+    conn.commit()
+    return True, pickle.loads(row[1])
+
+def put(source, key, value):
+    blob = pickle.dumps(value)
+    now = time.time()
+    conn = _conn()
+    conn.execute("BEGIN IMMEDIATE")       # the replaced row's size must not change under us
+    try:
+        old = conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                     (key, source, now, now, len(blob), blob))
+        _add_total(conn, len(blob) - (old[0] if old else 0))
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    evict()
+
+def _add_total(conn, delta):
+    conn.execute("UPDATE meta SET v = v + ? WHERE k = 'total_bytes'", (delta,))
+
+def total_bytes():
+    return _conn().execute("SELECT v FROM meta WHERE k = 'total_bytes'").fetchone()[0]
+
+def evict(max_bytes=None):
+    """Drop least-recently-used entries until the cache fits in max_bytes."""
+    max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+    if total_bytes() <= max_bytes:
+        return 0
+    conn = _conn()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        total = conn.execute("SELECT v FROM meta WHERE k = 'total_bytes'").fetchone()[0]
+        dropped = freed = 0
+        for key, size in conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            if total - freed <= max_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            freed += size
+            dropped += 1
+        _add_total(conn, -freed)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return dropped
+
+def cached(source, ttl=None):
+    """Decorator: cache a client call's return value on disk."""
+    def wrap(fn):
+        name = getattr(fn, "__qualname__", repr(fn))
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            key = make_key(source, name, args, kwargs)
+            hit, value = get(source, key, ttl)
+            if hit:
+                return value
+            value = fn(*args, **kwargs)
+            put(source, key, value)
+            return value
+        return inner
+    return wrap
+
+def stats():
+    """{source: {"hits": n, "misses": n}} for this process."""
+    with _lock:
+        return {s: dict(c) for s, c in _stats.items()}
+
+def stats_line():
+    parts = [f"{s}: {c['hits']} hit / {c['misses']} miss" for s, c in sorted(stats().items())]
+    return "🗄  http cache — " + (", ".join(parts) if parts else "unused")
+
+def clear(source=None):
+    conn = _conn()
+    with conn:
+        if source:
+            freed = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses WHERE source = ?",
+                                 (source,)).fetchone()[0]
+            conn.execute("DELETE FROM responses WHERE source = ?", (source,))
+            _add_total(conn, -freed)
+        else:
+            conn.execute("DELETE FROM responses")
+            conn.execute("UPDATE meta SET v = 0 WHERE k = 'total_bytes'")
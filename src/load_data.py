@@ -1,9 +1,9 @@
 
-import pandas as pd
+from dataset_cache import load
 
 def load_merged_data(path="data/processed/merged_data.csv"):
     try:
-        df = pd.read_csv(path)
+        df = load(path)     # parsed once per file version, see dataset_cache.py
         print(f"✅ Loaded merged dataset with {df.shape[0]} rows and {df.shape[1]} columns.")
         return df
     except FileNotFoundError:
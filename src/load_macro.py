@@ -1,35 +1,42 @@
 # src/load_macro.py
 """
 Idempotent loader for fact_macro:
-– Reads all data/clean/fred_*.parquet
+– Reads every series from data/clean/series_store.parquet
 – Registers each series_id from dim_series
 – Converts the first column to datetime
 – Skips any (date_id, series_id) already in the table
 – Appends only the new rows
+– Refreshes only the touched quarters of mv_macro (see materialize_macro.py)
+
+Modes (python src/load_macro.py [--bulk | --benchmark]):
+  default      per-series loop (one lookup + one existing-rows scan per file)
+  --bulk       stage every quarterly row from all files into a TEMPORARY
+               table in one pass, then merge with a single
+               INSERT ... ON DUPLICATE KEY UPDATE
+  --benchmark  time the loop and the bulk load, each filling an empty
+               scratch copy of fact_macro (fact_macro itself is never
+               touched), and report rows written per second for both
 """
-import os, glob, pandas as pd
-from sqlalchemy import create_engine, text
-from dotenv import load_dotenv
-
-# ——— 0. Debug: show working dir & files ——————————————
-print("Working dir:", os.getcwd())
-parquet_files = glob.glob("data/clean/fred_*.parquet")
-print("Files found:", parquet_files)
-
-# ——— 1. Create engine —————————————————————————————————
-load_dotenv()  
-engine = create_engine(
-    f"mysql+mysqlconnector://{os.getenv('MYSQL_USER')}:"
-    f"{os.getenv('MYSQL_PW')}@{os.getenv('MYSQL_HOST')}"
-    f":{os.getenv('MYSQL_PORT')}/{os.getenv('MYSQL_DB')}",
-    connect_args={"allow_local_infile": True}
-)
-with engine.connect() as conn:
-    min_date_id, max_date_id = conn.execute(
-        text("SELECT MIN(date_id), MAX(date_id) FROM dim_date")
-    ).one()
+import os, sys, time, tempfile
+import pandas as pd
+from sqlalchemy import text
+from db import get_engine
+from series_store import read_frames
+from materialize_macro import refresh
+
+BULK_BATCH = 5_000   # rows per executemany batch when LOCAL INFILE is refused
+BENCH_TABLE = "fact_macro_bench"   # scratch target for --benchmark
+
+# ——— 1. Shared engine ——————————————————————————————————
+engine = get_engine()
 
 # ——— 2. Helpers ————————————————————————————————————
+def get_date_id_range():
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT MIN(date_id), MAX(date_id) FROM dim_date")
+        ).one()
+
 def get_series_id(code):
     with engine.connect() as conn:
         return conn.execute(
@@ -37,54 +44,207 @@ def get_series_id(code):
             {"c": code}
         ).scalar_one()
 
-def get_existing_date_ids(series_id):
+def get_existing_date_ids(series_id, table="fact_macro"):
     with engine.connect() as conn:
         return set(conn.execute(
-            text("SELECT date_id FROM fact_macro WHERE series_id = :sid"),
+            text(f"SELECT date_id FROM {table} WHERE series_id = :sid"),
             {"sid": series_id}
         ).scalars().all())
 
-# ——— 3. Load loop ——————————————————————————————————
-total_loaded = 0
-# … your imports and setup …
+def load_frames(frames=None):
+    """Fill (and return) a shared {code: DataFrame[date, code]} dict from the series store."""
+    frames = {} if frames is None else frames
+    if not frames:
+        frames.update(read_frames())
+    return frames
 
-for path in parquet_files:
-    code = os.path.basename(path).replace("fred_","").replace(".parquet","")
-    sid  = get_series_id(code)
-    print(f"\nLoading {code} (series_id={sid})…")
-
-    df = pd.read_parquet(path, engine="pyarrow")
+def to_quarterly(df, min_date_id, max_date_id):
+    """Roll a (date, value) frame up to quarterly means keyed by date_id."""
     df = df.rename(columns={df.columns[0]:"date", df.columns[1]:"value_num"})
     df["date"] = pd.to_datetime(df["date"])
-    
-    # *** NEW: roll up to quarterly ***
+
+    # roll up to quarterly
     df["year_qtr"] = df["date"].dt.to_period("Q")
     df_q = (
         df.groupby("year_qtr", as_index=False)["value_num"]
           .mean()   # or .sum() if that makes sense
     )
     df_q = df_q.dropna(subset=["value_num"])
-    
-    df_q["date_id"]     = df_q["year_qtr"].dt.year*100 + df_q["year_qtr"].dt.quarter
-    df_q["series_id"]   = sid
+
+    df_q["date_id"] = df_q["year_qtr"].dt.year*100 + df_q["year_qtr"].dt.quarter
     # keep only those quarters that exist in dim_date
-    df_q = df_q[(df_q["date_id"] >= min_date_id) & (df_q["date_id"] <= max_date_id)]
+    return df_q[(df_q["date_id"] >= min_date_id) & (df_q["date_id"] <= max_date_id)]
+
+# ——— 3. Load loop ——————————————————————————————————
+def load_loop(frames, table="fact_macro"):
+    """Original per-series loader. Returns the number of rows inserted.
+    mv_macro is only refreshed when loading fact_macro itself."""
+    min_date_id, max_date_id = get_date_id_range()
+    total_loaded = 0
+    touched = set()
+
+    for code, df in frames.items():
+        sid  = get_series_id(code)
+        print(f"\nLoading {code} (series_id={sid})…")
+
+        df_q = to_quarterly(df, min_date_id, max_date_id)
+        df_q["series_id"] = sid
+
+        # filter out already-loaded quarters
+        existing = get_existing_date_ids(sid, table)
+        to_insert = df_q[~df_q["date_id"].isin(existing)]
+        if to_insert.empty:
+            print("  No new quarters to insert; skipping.")
+            continue
+
+        # insert
+        records = to_insert[["date_id","series_id","value_num"]]
+        count = len(records)
+        records.to_sql(table, engine,
+                       if_exists="append", index=False, method="multi")
+        print(f"  ➔ Inserted {count} new quarterly rows")
+        total_loaded += count
+        touched.update(records["date_id"].tolist())
+
+    if touched and table == "fact_macro":
+        refresh(touched, engine)
+        print(f"  ➔ Refreshed {len(touched)} quarters of mv_macro")
+    return total_loaded
+
+# ——— 4. Bulk load ——————————————————————————————————
+def collect_quarterly(frames, min_date_id, max_date_id):
+    """Stack every series' quarterly rows into one (fred_code, date_id, value_num) frame."""
+    parts = []
+    for code, df in frames.items():
+        df_q = to_quarterly(df, min_date_id, max_date_id)
+        df_q["fred_code"] = code
+        parts.append(df_q[["fred_code","date_id","value_num"]])
+    if not parts:
+        return pd.DataFrame(columns=["fred_code","date_id","value_num"])
+    return pd.concat(parts, ignore_index=True)
+
+def _stage_infile(conn, rows):
+    """Stream the staging rows through LOAD DATA LOCAL INFILE."""
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as fh:
+        rows.to_csv(fh, index=False, header=False, lineterminator="\n")
+        tmp_path = fh.name
+    try:
+        conn.exec_driver_sql(
+            f"LOAD DATA LOCAL INFILE '{tmp_path}' INTO TABLE tmp_fact_macro "
+            "FIELDS TERMINATED BY ',' LINES TERMINATED BY '\\n' "
+            "(fred_code, date_id, value_num)"
+        )
+    finally:
+        os.remove(tmp_path)
+
+def _stage_executemany(conn, rows):
+    """Fallback when the server refuses LOCAL INFILE: batched executemany."""
+    insert = text("INSERT INTO tmp_fact_macro (fred_code, date_id, value_num) "
+                  "VALUES (:fred_code, :date_id, :value_num)")
+    records = rows.to_dict("records")
+    for start in range(0, len(records), BULK_BATCH):
+        conn.execute(insert, records[start:start + BULK_BATCH])
+
+def load_bulk(frames, table="fact_macro"):
+    """Set-based loader. Returns the number of rows inserted or changed.
+    mv_macro is only refreshed when loading fact_macro itself."""
+    min_date_id, max_date_id = get_date_id_range()
+    rows = collect_quarterly(frames, min_date_id, max_date_id)
+    rows["date_id"] = rows["date_id"].astype(int)
+    if rows.empty:
+        print("  No quarterly rows found; nothing to stage.")
+        return 0
+
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TEMPORARY TABLE tmp_fact_macro (
+              fred_code  VARCHAR(25)   NOT NULL,
+              date_id    INT           NOT NULL,
+              value_num  DECIMAL(18,4) NOT NULL,
+              PRIMARY KEY (fred_code, date_id)
+            )
+        """))
+        try:
+            _stage_infile(conn, rows)
+        except Exception as e:
+            print(f"  LOCAL INFILE unavailable ({e}); falling back to executemany")
+            conn.execute(text("DELETE FROM tmp_fact_macro"))
+            _stage_executemany(conn, rows)
+
+        missing = conn.execute(text("""
+            SELECT DISTINCT t.fred_code
+            FROM tmp_fact_macro t
+            LEFT JOIN dim_series s ON s.fred_code = t.fred_code
+            WHERE s.series_id IS NULL
+        """)).scalars().all()
+        if missing:
+            print(f"⚠️  not in dim_series, skipped: {sorted(missing)}")
+
+        # rows whose value is new or different — their quarters are the only ones mv_macro needs
+        written = conn.execute(text(f"""
+            SELECT t.date_id
+            FROM tmp_fact_macro t
+            JOIN dim_series s ON s.fred_code = t.fred_code
+            LEFT JOIN {table} f
+              ON f.date_id = t.date_id AND f.series_id = s.series_id
+            WHERE f.value_num IS NULL OR f.value_num <> t.value_num
+        """)).scalars().all()
+        touched = set(written)
+
+        conn.execute(text(f"""
+            INSERT INTO {table} (date_id, series_id, value_num)
+            SELECT t.date_id, s.series_id, t.value_num
+            FROM tmp_fact_macro t
+            JOIN dim_series s ON s.fred_code = t.fred_code
+            ON DUPLICATE KEY UPDATE value_num = VALUES(value_num)
+        """))
+        conn.execute(text("DROP TEMPORARY TABLE tmp_fact_macro"))
+
+    if touched and table == "fact_macro":
+        refresh(touched, engine)
+        print(f"  ➔ Refreshed {len(touched)} quarters of mv_macro")
+    return len(written)
 
+# ——— 5. Benchmark ——————————————————————————————————
+def timed(label, fn, frames, **kw):
+    t0 = time.perf_counter()
+    rows = fn(frames, **kw)
+    secs = time.perf_counter() - t0
+    rate = rows / secs if secs > 0 else float("inf")
+    print(f"⏱  {label:<5} {rows:>8,} rows in {secs:7.2f}s  →  {rate:,.0f} rows/sec")
+    return rows, secs
 
-    # filter out already-loaded quarters
-    existing = get_existing_date_ids(sid)
-    to_insert = df_q[~df_q["date_id"].isin(existing)]
-    if to_insert.empty:
-        print("  No new quarters to insert; skipping.")
-        continue
+def benchmark(frames):
+    """Time a full load with each loader into BENCH_TABLE, an empty table
+    with fact_macro's structure, emptied again before each run. fact_macro
+    and mv_macro are never written."""
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {BENCH_TABLE}"))
+        conn.execute(text(f"CREATE TABLE {BENCH_TABLE} LIKE fact_macro"))
+    try:
+        for label, fn in (("loop", load_loop), ("bulk", load_bulk)):
+            with engine.begin() as conn:
+                conn.execute(text(f"TRUNCATE TABLE {BENCH_TABLE}"))
+            timed(label, fn, frames, table=BENCH_TABLE)
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {BENCH_TABLE}"))
 
-    # insert
-    records = to_insert[["date_id","series_id","value_num"]]
-    count = len(records)
-    records.to_sql("fact_macro", engine,
-                   if_exists="append", index=False, method="multi")
-    print(f"  ➔ Inserted {count} new quarterly rows")
-    total_loaded += count
+def main(argv=None, frames=None):
+    """frames: optional {fred_code: DataFrame} shared with later stages."""
+    argv = sys.argv[1:] if argv is None else argv
+    print("Working dir:", os.getcwd())
+    frames = load_frames(frames)
+    print("Series found:", sorted(frames))
 
+    if "--benchmark" in argv:
+        benchmark(frames)
+    elif "--bulk" in argv:
+        rows, _ = timed("bulk", load_bulk, frames)
+        print(f"\n✔ Done: merged {rows} new or changed quarterly rows into fact_macro")
+    else:
+        total_loaded = load_loop(frames)
+        print(f"\n✔ Done: loaded {total_loaded} new rows into fact_macro")
 
-print(f"\n✔ Done: loaded {total_loaded} new rows into fact_macro")
+if __name__ == "__main__":
+    main()
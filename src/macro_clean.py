@@ -2,111 +2,157 @@
 """
 ETL for macro-economic series:
   • FRED CSVs       → data/raw/fred/*.csv
-  • BLS TXT/CSVs    → data/raw/bls/*.txt, *.csv
+  • BLS TXT/CSVs    → data/raw/bls/*.txt, *.csv (QCEW files: see bls_qcew.py)
   • BEA Excel       → data/raw/bea/*.xls*
   • Maddison Excel  → data/raw/maddison/*.xls*
 
-Output: tidy 2-column CSVs in data/clean/, wiping out any old files first.
+Output: tidy typed (date: datetime64, value: float64) Parquet files in
+data/clean/macro/. Every raw file is its own job on a process pool; a job
+is skipped when its source hash matches the manifest and its output is
+still there, and outputs are written to a temp file and renamed into
+place, so an interrupted run never leaves a half-written file and nothing
+is wiped up front.
 """
 
-import pandas as pd, re, shutil
+import os, re, sys
+import pandas as pd
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from fingerprint import file_digest, load_state, save_state
+from bls_qcew import is_qcew
 
 # ── Paths ───────────────────────────────────────────────────────────
-BASE      = Path(__file__).resolve().parent        # project root
+BASE      = Path(__file__).resolve().parent.parent  # project root
 RAW_DIR   = BASE / "data" / "raw"
-CLEAN_DIR = BASE / "data" / "clean"
-
-# 1) Nuke the old clean folder so NOTHING lingers
-if CLEAN_DIR.exists():
-    shutil.rmtree(CLEAN_DIR)
-CLEAN_DIR.mkdir(parents=True, exist_ok=True)
+CLEAN_DIR = BASE / "data" / "clean" / "macro"
+MANIFEST  = CLEAN_DIR / ".manifest.json"
 
 def sanitize(name: str) -> str:
     """Make a filesystem-safe stem from any string."""
     return re.sub(r"[^\w]+", "_", name).strip("_").lower()
 
-def save_csv(df: pd.DataFrame, stem: str):
-    """Save df[date,value] to data/clean/stem.csv."""
-    out = CLEAN_DIR / f"{stem}.csv"
-    df.to_csv(out, index=False)
-    print(f"✓ saved {out.name}")
-
-# ── 2) FRED series ──────────────────────────────────────────────────
-fred_folder = RAW_DIR / "fred"
-if fred_folder.exists():
-    for f in fred_folder.glob("*.csv"):
-        df = pd.read_csv(f)
-        # assume first two columns are date + value
-        df = df.rename(columns={df.columns[0]:"date", df.columns[1]:"value"})
+def tidy(df: pd.DataFrame) -> pd.DataFrame:
+    """Typed two-column frame: date (datetime64) + value (float64)."""
+    out = pd.DataFrame({
+        "date":  pd.to_datetime(df["date"], errors="coerce"),
+        "value": pd.to_numeric(df["value"], errors="coerce").astype("float64"),
+    })
+    return out.reset_index(drop=True)
+
+def save_parquet(df: pd.DataFrame, stem: str):
+    """Atomically write df[date,value] to data/clean/macro/stem.parquet."""
+    out = CLEAN_DIR / f"{stem}.parquet"
+    tmp = out.with_name(f".{out.name}.{os.getpid()}.tmp")
+    try:
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, out)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return out
+
+# ── 1) FRED series ──────────────────────────────────────────────────
+def clean_fred(f: Path):
+    df = pd.read_csv(f)
+    # assume first two columns are date + value
+    df = df.rename(columns={df.columns[0]:"date", df.columns[1]:"value"})
+    return tidy(df)
+
+# ── 2) BLS series ──────────────────────────────────────────────────
+def clean_bls(f: Path):
+    sep = "\t" if f.suffix.lower()==".txt" else ","
+    # let the C parser infer every column's dtype in the same pass that
+    # reads the file; only the date parts are pinned to strings
+    df = pd.read_csv(f, sep=sep, comment="#", thousands=",",
+                     dtype={"year": str, "period": str})
+
+    # Build a date column
+    if {"year","period"}.issubset(df.columns):
+        df["date"] = pd.to_datetime(
+            df["year"].astype(str) + df["period"].str[1:] + "01",
+            errors="coerce"
+        )
+    elif "date" in df.columns:
         df["date"] = pd.to_datetime(df["date"], errors="coerce")
-        stem = f"fred_{sanitize(f.stem)}"
-        save_csv(df[["date","value"]], stem)
-
-# ── 3) BLS series ──────────────────────────────────────────────────
-bls_folder = RAW_DIR / "bls"
-if bls_folder.exists():
-    for f in bls_folder.iterdir():
-        if f.suffix.lower() not in [".txt", ".csv"]:
-            continue
-        print(f"Processing BLS file: {f.name}")
-        sep = "\t" if f.suffix.lower()==".txt" else ","
-        df = pd.read_csv(f, sep=sep, comment="#", dtype=str)
-
-        # Build a date column
-        if {"year","period"}.issubset(df.columns):
-            df["date"] = pd.to_datetime(
-                df["year"].astype(str) + df["period"].str[1:] + "01",
-                errors="coerce"
-            )
-        elif "date" in df.columns:
-            df["date"] = pd.to_datetime(df["date"], errors="coerce")
-        else:
-            print(f"⚠️  skipping {f.name}: no date info")
-            continue
+    else:
+        raise ValueError("no date info")
+
+    # First column whose every value parsed as a number
+    num_cols = df.drop(columns=["year","period","date"], errors="ignore") \
+                 .select_dtypes("number").columns
+    if num_cols.empty:
+        raise ValueError("no numeric column found")
 
-        # Find the first numeric column
-        num_cols = [c for c in df.columns if c not in ("year","period","date")]
-        valcol = None
-        for c in num_cols:
-            try:
-                pd.to_numeric(df[c].str.replace(",",""), errors="raise")
-                valcol = c
-                break
-            except Exception:
-                continue
-        if not valcol:
-            print(f"⚠️  skipping {f.name}: no numeric column found")
+    df["value"] = df[num_cols[0]]
+    return tidy(df)
+
+# ── 3) BEA key source ───────────────────────────────────────────────
+def clean_bea(f: Path):
+    df = pd.read_excel(f, sheet_name=0, skiprows=7)
+    df = df.iloc[:, :2].rename(columns={df.columns[0]:"year", df.columns[1]:"value"})
+    df["date"] = pd.to_datetime(df["year"], format="%Y", errors="coerce")
+    return tidy(df)
+
+# ── 4) Maddison Project GDP ─────────────────────────────────────────
+def clean_maddison(f: Path):
+    mpd = pd.read_excel(f, sheet_name="Full data", engine="openpyxl")
+    usa = mpd[mpd["countrycode"]=="USA"]
+    df  = usa[["year","rgdpnapc"]].rename(columns={"rgdpnapc":"value"})
+    df["date"] = pd.to_datetime(df["year"], format="%Y", errors="coerce")
+    return tidy(df)
+
+CLEANERS = {"fred": clean_fred, "bls": clean_bls,
+            "bea": clean_bea, "maddison": clean_maddison}
+
+def discover_jobs():
+    """(kind, source, output stem) for every raw file we know how to clean."""
+    jobs = []
+    for f in sorted((RAW_DIR / "fred").glob("*.csv")):
+        jobs.append(("fred", f, f"fred_{sanitize(f.stem)}"))
+    for f in sorted((RAW_DIR / "bls").glob("*")):
+        # QCEW establishment files are ingested by bls_qcew.py, not as a series
+        if f.suffix.lower() in (".txt", ".csv") and not is_qcew(f):
+            jobs.append(("bls", f, f"bls_{sanitize(f.stem)}"))
+    for f in sorted((RAW_DIR / "bea").glob("*.xls*")):
+        jobs.append(("bea", f, f"bea_{sanitize(f.stem)}"))
+    for f in sorted((RAW_DIR / "maddison").glob("*.xls*")):
+        jobs.append(("maddison", f, "maddison_gdp"))
+    return jobs
+
+def run_job(job):
+    """Worker entry point: clean one file. Returns (stem, message)."""
+    kind, f, stem = job
+    try:
+        out = save_parquet(CLEANERS[kind](f), stem)
+        return stem, f"✓ saved {out.name}"
+    except Exception as e:
+        return stem, f"⚠️  could not process {kind.upper()} file {f.name}: {e}"
+
+def main(workers=None):
+    CLEAN_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = load_state(MANIFEST)
+    stat_cache = manifest.setdefault("stat_cache", {})
+    sources = manifest.setdefault("sources", {})
+    script_hash = file_digest(__file__, stat_cache)
+
+    jobs = discover_jobs()
+    todo, digests = [], {}
+    for kind, f, stem in jobs:
+        digest = f"{script_hash}:{file_digest(f, stat_cache)}"
+        if sources.get(stem) == digest and (CLEAN_DIR / f"{stem}.parquet").exists():
             continue
+        digests[stem] = digest
+        todo.append((kind, f, stem))
+    print(f"{len(todo)} file(s) to clean, {len(jobs) - len(todo)} up to date")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for stem, msg in pool.map(run_job, todo):
+            print(msg)
+            if msg.startswith("✓"):
+                sources[stem] = digests[stem]
+
+    save_state(MANIFEST, manifest)
+    print(f"\n🏁 macro_clean.py completed — cleaned Parquet in {CLEAN_DIR.relative_to(BASE)}/")
 
-        df["value"] = pd.to_numeric(df[valcol].str.replace(",",""), errors="coerce")
-        stem = f"bls_{sanitize(f.stem)}"
-        save_csv(df[["date","value"]], stem)
-
-# ── 4) BEA key source ───────────────────────────────────────────────
-bea_folder = RAW_DIR / "bea"
-if bea_folder.exists():
-    for f in bea_folder.glob("*.xls*"):
-        try:
-            df = pd.read_excel(f, sheet_name=0, skiprows=7)
-            df = df.iloc[:, :2].rename(columns={df.columns[0]:"year", df.columns[1]:"value"})
-            df["date"] = pd.to_datetime(df["year"], format="%Y", errors="coerce")
-            stem = f"bea_{sanitize(f.stem)}"
-            save_csv(df[["date","value"]], stem)
-        except Exception as e:
-            print(f"⚠️  could not process BEA file {f.name}: {e}")
-
-# ── 5) Maddison Project GDP ─────────────────────────────────────────
-mpd_folder = RAW_DIR / "maddison"
-if mpd_folder.exists():
-    for f in mpd_folder.glob("*.xls*"):
-        try:
-            mpd = pd.read_excel(f, sheet_name="Full data", engine="openpyxl")
-            usa = mpd[mpd["countrycode"]=="USA"]
-            df  = usa[["year","rgdpnapc"]].rename(columns={"rgdpnapc":"value"})
-            df["date"] = pd.to_datetime(df["year"], format="%Y", errors="coerce")
-            save_csv(df[["date","value"]], "maddison_gdp")
-        except Exception as e:
-            print(f"⚠️  could not process Maddison file {f.name}: {e}")
-
-print("\n🏁 macro_clean.py completed — cleaned CSVs in data/clean/")
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,97 @@
+# src/maddison_store.py
+"""
+Country-partitioned Maddison Project store.
+
+  data/clean/maddison/country=<name>/part-0.parquet   columns (year int16, gdp_pc_2011usd float64)
+
+One directory per country, each file sorted by year with row-group
+min/max statistics. read_maddison() opens only the requested countries'
+directories and pushes the year range down as a row-group predicate, so
+drawing the US line reads one small file instead of parsing the whole
+world panel from CSV.
+
+  from maddison_store import read_maddison
+  us = read_maddison(["United States"], years=(1950, 2022))
+
+Build it from clean_maddison.py's long CSV:  python src/maddison_store.py
+"""
+import os, shutil, sys
+from urllib.parse import unquote
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+MADDISON_CSV = "data/processed/maddison/maddison_gdp.csv"
+STORE_DIR    = "data/clean/maddison"
+VALUE        = "gdp_pc_2011usd"
+
+SCHEMA = pa.schema([
+    ("year",    pa.int16()),
+    ("country", pa.string()),
+    (VALUE,     pa.float64()),
+])
+PARTITIONING = ds.partitioning(pa.schema([("country", pa.string())]), flavor="hive")
+
+def write_store(long_df, root=STORE_DIR):
+    """Write a (year, country, value) frame as one sorted file per country, atomically."""
+    df = pd.DataFrame({
+        "year":    pd.to_numeric(long_df["year"], errors="coerce"),
+        "country": long_df["country"].astype(str),
+        VALUE:     pd.to_numeric(long_df[VALUE], errors="coerce").astype("float64"),
+    }).dropna(subset=["year"]).astype({"year": "int16"})
+    df = df.sort_values(["country", "year"], kind="stable")
+    table = pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False)
+
+    tmp = f"{root}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    ds.write_dataset(table, tmp, format="parquet", partitioning=PARTITIONING,
+                     basename_template="part-{i}.parquet",
+                     file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"))
+    # swap the finished tree into place so readers never see half a store
+    old = f"{root}.old"
+    shutil.rmtree(old, ignore_errors=True)
+    if os.path.exists(root):
+        os.replace(root, old)
+    os.replace(tmp, root)
+    shutil.rmtree(old, ignore_errors=True)
+    return df["country"].nunique()
+
+def _partition_dirs(root):
+    """{country: directory} from the directory names only."""
+    return {unquote(d.split("=", 1)[1]): os.path.join(root, d)
+            for d in os.listdir(root) if d.startswith("country=")}
+
+def countries(root=STORE_DIR):
+    """Country names in the store."""
+    return sorted(_partition_dirs(root))
+
+def read_maddison(countries=None, years=None, root=STORE_DIR):
+    """(year, country, gdp_pc_2011usd) for the given countries and (start, end) years, inclusive."""
+    source = root
+    if countries is not None:
+        wanted = [countries] if isinstance(countries, str) else list(countries)
+        dirs = _partition_dirs(root)
+        # open only the requested countries' files; unknown names just return no rows
+        source = [os.path.join(dirs[c], f) for c in wanted if c in dirs
+                  for f in sorted(os.listdir(dirs[c])) if f.endswith(".parquet")]
+        if not source:
+            return pd.DataFrame({"year": pd.Series(dtype="int16"),
+                                 "country": pd.Series(dtype="str"),
+                                 VALUE: pd.Series(dtype="float64")})
+
+    flt = None
+    if years is not None:
+        start, end = years
+        if start is not None:
+            flt = ds.field("year") >= start
+        if end is not None:
+            flt = (ds.field("year") <= end) if flt is None else flt & (ds.field("year") <= end)
+    dataset = ds.dataset(source, format="parquet", partitioning=PARTITIONING,
+                         partition_base_dir=root)
+    df = dataset.to_table(filter=flt, columns=["year", "country", VALUE]).to_pandas()
+    return df.sort_values(["country", "year"]).reset_index(drop=True)
+
+if __name__ == "__main__":
+    src = sys.argv[1] if len(sys.argv) > 1 else MADDISON_CSV
+    n = write_store(pd.read_csv(src))
+    print(f"✔ {STORE_DIR}: {n} countries")
@@ -0,0 +1,90 @@
+# src/materialize_macro.py
+"""
+mv_macro: a materialized, incrementally refreshed version of vw_macro.
+
+One row per date_id (PRIMARY KEY) and one DECIMAL column per series in
+dim_series, generated from dim_series instead of a hand-written CASE list.
+The eight vw_macro series keep their vw_macro names (real_gdp, ict_inv, ...);
+any other series gets its lower-cased FRED code. New series become new
+columns the next time the table is refreshed.
+
+load_macro calls refresh(date_ids=...) with the quarters it just wrote, so
+only those rows are re-aggregated. Run this script directly for a full
+rebuild:  python src/materialize_macro.py
+"""
+import re
+from sqlalchemy import text
+from db import get_engine
+from panel_builder import VW_MACRO_COLUMNS
+
+MV_TABLE = "mv_macro"
+REFRESH_CHUNK = 1_000      # date_ids per IN (...) list
+
+def column_for(code):
+    return VW_MACRO_COLUMNS.get(code) or re.sub(r"[^\w]+", "_", code).lower()
+
+def series_columns(conn):
+    """[(series_id, column_name)] for every series in dim_series."""
+    rows = conn.execute(text(
+        "SELECT series_id, fred_code FROM dim_series ORDER BY series_id"
+    )).all()
+    return [(sid, column_for(code)) for sid, code in rows]
+
+def ensure_table(conn):
+    """Create mv_macro if needed and add a column for any new series."""
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {MV_TABLE} (
+          date_id  INT  NOT NULL PRIMARY KEY,
+          `date`   DATE NOT NULL,
+          KEY idx_mv_date (`date`)
+        )
+    """))
+    existing = set(conn.execute(text("""
+        SELECT COLUMN_NAME FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :t
+    """), {"t": MV_TABLE}).scalars().all())
+    cols = series_columns(conn)
+    for _, col in cols:
+        if col not in existing:
+            conn.execute(text(f"ALTER TABLE {MV_TABLE} ADD COLUMN `{col}` DECIMAL(18,4) NULL"))
+            print(f"  ➕ {MV_TABLE}.{col}")
+    return cols
+
+def _refresh_sql(cols, where=""):
+    pivots = ",\n".join(
+        f"  MAX(CASE WHEN f.series_id = {sid} THEN f.value_num END) AS `{col}`"
+        for sid, col in cols
+    )
+    names  = ", ".join(f"`{col}`" for _, col in cols)
+    update = ", ".join(f"`{col}` = VALUES(`{col}`)" for _, col in cols)
+    return f"""
+        INSERT INTO {MV_TABLE} (date_id, `date`, {names})
+        SELECT d.date_id, d.date_actual,
+        {pivots}
+        FROM fact_macro f
+        JOIN dim_date d USING(date_id)
+        {where}
+        GROUP BY d.date_id, d.date_actual
+        ON DUPLICATE KEY UPDATE `date` = VALUES(`date`), {update}
+    """
+
+def refresh(date_ids=None, engine=None):
+    """Re-aggregate the given quarters (all quarters when date_ids is None)."""
+    engine = engine or get_engine()
+    with engine.begin() as conn:
+        cols = ensure_table(conn)
+        if not cols:
+            return 0
+        if date_ids is None:
+            conn.execute(text(_refresh_sql(cols)))
+            return conn.execute(text(f"SELECT COUNT(*) FROM {MV_TABLE}")).scalar_one()
+
+        ids = sorted({int(i) for i in date_ids})
+        for start in range(0, len(ids), REFRESH_CHUNK):
+            chunk = ids[start:start + REFRESH_CHUNK]
+            conn.execute(text(_refresh_sql(cols, f"WHERE f.date_id IN ({','.join(map(str, chunk))})")))
+        return len(ids)
+
+if __name__ == "__main__":
+    n = refresh()
+    print(f"✔ {MV_TABLE} rebuilt: {n} quarters")
@@ -0,0 +1,215 @@
+# src/model_cv.py
+"""
+Expanding-window cross-validation for the wide_panel models.
+
+Each spec names a model, a target and its predictors:
+
+  {"name": "rf_controls", "model": "rf", "y": "gdp_g",
+   "x": ["ict_g", "rd_g", "recession_dummy"], "params": {"max_depth": 5}}
+
+evaluate() builds every distinct (y, x) design matrix once (rows with a NaN
+in y or x dropped, in date order), scores each spec with TimeSeriesSplit
+folds (train on everything before the test block, so no look-ahead), refits
+on the full sample and computes feature importances: mean |SHAP| when shap
+is installed and can explain the model, otherwise permutation importance.
+Spec names key the results, so they must be unique.
+
+Results are cached in .cache/model_cv/<key>.pkl, keyed by a hash of the
+design matrix itself plus the spec and CV settings, so rerunning an
+unchanged spec is a file read; editing unrelated panel columns does not
+invalidate it. Specs that miss the cache are fitted on a process pool.
+
+  python src/model_cv.py                 # default specs → comparison table
+  python src/model_cv.py --splits 8 --fresh
+
+  from model_cv import evaluate, SPECS
+  table, importances = evaluate(SPECS)
+"""
+import argparse, hashlib, json, os, pickle, time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.base import clone
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.inspection import permutation_importance
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import TimeSeriesSplit
+
+PANEL     = "data/processed/wide_panel.parquet"
+CACHE_DIR = ".cache/model_cv"
+
+MODELS = {
+    "linear": LinearRegression,
+    "ridge":  Ridge,
+    "rf":     RandomForestRegressor,
+    "gbr":    GradientBoostingRegressor,
+}
+
+CONTROLS = ["ict_g", "rd_g", "recession_dummy", "unemp_rate_g", "inflation_g"]
+SPECS = [
+    {"name": "ols_ict_rd",   "model": "linear", "y": "gdp_g", "x": ["ict_g", "rd_g"]},
+    {"name": "ols_recession", "model": "linear", "y": "gdp_g", "x": ["ict_g", "rd_g", "recession_dummy"]},
+    {"name": "ols_controls", "model": "linear", "y": "gdp_g", "x": CONTROLS},
+    {"name": "ridge_controls", "model": "ridge", "y": "gdp_g", "x": CONTROLS, "params": {"alpha": 1.0}},
+    {"name": "rf_controls",  "model": "rf", "y": "gdp_g", "x": CONTROLS,
+     "params": {"n_estimators": 200, "max_depth": 5, "random_state": 1}},
+    {"name": "gbr_controls", "model": "gbr", "y": "gdp_g", "x": CONTROLS,
+     "params": {"n_estimators": 200, "max_depth": 2, "learning_rate": 0.05, "random_state": 1}},
+]
+
+# ── design matrices ─────────────────────────────────────────────────
+def design(df, y, x, time_col="date"):
+    """(X, y) arrays for complete rows in time order."""
+    d = df.sort_values(time_col)[[y] + list(x)].dropna()
+    return d[list(x)].to_numpy(dtype="float64"), d[y].to_numpy(dtype="float64")
+
+def data_hash(X, y):
+    h = hashlib.blake2b(digest_size=16)
+    for a in (X, y):
+        h.update(str(a.shape).encode())
+        h.update(np.ascontiguousarray(a).tobytes())
+    return h.hexdigest()
+
+def cache_key(spec, X, y, n_splits, importance):
+    spec_json = json.dumps(spec, sort_keys=True, default=str)
+    return hashlib.blake2b(
+        "\0".join([data_hash(X, y), spec_json, str(n_splits), importance,
+                   sklearn.__version__]).encode(), digest_size=16).hexdigest()
+
+def _cache_load(cache_dir, key):
+    path = os.path.join(cache_dir, f"{key}.pkl")
+    try:
+        with open(path, "rb") as fh:
+            return pickle.load(fh)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+def _cache_save(cache_dir, key, result):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{key}.pkl")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fh:
+        pickle.dump(result, fh)
+    os.replace(tmp, path)
+
+# ── fitting (runs in worker processes) ──────────────────────────────
+def _importance(model, X, y, names, mode):
+    if mode in ("auto", "shap"):
+        try:
+            import shap
+            values = shap.Explainer(model, X)(X).values
+            return "shap", dict(zip(names, np.abs(values).mean(axis=0)))
+        except Exception:                      # not installed, or no explainer for this model
+            if mode == "shap":
+                raise
+    pi = permutation_importance(model, X, y, n_repeats=10, random_state=0)
+    return "permutation", dict(zip(names, pi.importances_mean))
+
+def _fit_spec(args):
+    spec, X, y, n_splits, importance = args
+    model = MODELS[spec["model"]](**spec.get("params", {}))
+    folds = []
+    for train, test in TimeSeriesSplit(n_splits=n_splits).split(X):
+        m = clone(model).fit(X[train], y[train])
+        pred = m.predict(X[test])
+        folds.append({"train": len(train), "test": len(test),
+                      "rmse": mean_squared_error(y[test], pred) ** 0.5,
+                      "mae": mean_absolute_error(y[test], pred),
+                      "r2": r2_score(y[test], pred)})
+    final = clone(model).fit(X, y)
+    method, imp = _importance(final, X, y, spec["x"], importance)
+    return {"folds": folds, "in_sample_r2": r2_score(y, final.predict(X)),
+            "importance": imp, "importance_method": method, "model": final, "n_obs": len(y)}
+
+# ── driver ──────────────────────────────────────────────────────────
+def evaluate(specs=SPECS, df=None, panel=PANEL, n_splits=5, importance="auto",
+             workers=None, cache_dir=CACHE_DIR, fresh=False):
+    """
+    (table, importances): one comparison row per spec, and a long
+    (spec, feature, importance, method) frame. Fitted models are in the cache.
+    """
+    names = [s["name"] for s in specs]
+    dupes = sorted({n for n in names if names.count(n) > 1})
+    if dupes:
+        raise ValueError(f"duplicate spec names: {dupes}")
+    if df is None:
+        df = pd.read_parquet(panel)
+    matrices, tasks, results, cached = {}, {}, {}, set()
+    for spec in specs:
+        spec = {"y": "gdp_g", **spec}
+        cols = (spec["y"], tuple(spec["x"]))
+        if cols not in matrices:                       # one design matrix per column set
+            matrices[cols] = design(df, *cols)
+        X, y = matrices[cols]
+        key = cache_key(spec, X, y, n_splits, importance)
+        hit = None if fresh else _cache_load(cache_dir, key)
+        if hit is not None:
+            results[spec["name"]] = hit
+            cached.add(spec["name"])
+        else:
+            tasks[spec["name"]] = (key, (spec, X, y, n_splits, importance))
+
+    if tasks:
+        names = list(tasks)
+        workers = max(1, min(workers or os.cpu_count() or 1, len(names)))
+        if workers == 1:
+            fitted = [_fit_spec(tasks[n][1]) for n in names]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                fitted = list(pool.map(_fit_spec, [tasks[n][1] for n in names]))
+        for name, res in zip(names, fitted):
+            _cache_save(cache_dir, tasks[name][0], res)
+            results[name] = res
+
+    rows, imps = [], []
+    for spec in specs:
+        res = results[spec["name"]]
+        folds = pd.DataFrame(res["folds"])
+        top = max(res["importance"], key=res["importance"].get)
+        rows.append({"spec": spec["name"], "model": spec["model"], "n_x": len(spec["x"]),
+                     "n_obs": res["n_obs"],
+                     "cv_rmse": folds["rmse"].mean(), "cv_rmse_sd": folds["rmse"].std(),
+                     "cv_mae": folds["mae"].mean(), "cv_r2": folds["r2"].mean(),
+                     "in_sample_r2": res["in_sample_r2"], "top_feature": top,
+                     "cached": spec["name"] in cached})
+        imps += [{"spec": spec["name"], "feature": f, "importance": v,
+                  "method": res["importance_method"]} for f, v in res["importance"].items()]
+    table = pd.DataFrame(rows).sort_values("cv_rmse").reset_index(drop=True)
+    return table, pd.DataFrame(imps)
+
+def load_model(spec, df=None, panel=PANEL, n_splits=5, importance="auto", cache_dir=CACHE_DIR):
+    """Full-sample fitted model for a spec from the cache (None if not evaluated yet)."""
+    if df is None:
+        df = pd.read_parquet(panel)
+    spec = {"y": "gdp_g", **spec}
+    X, y = design(df, spec["y"], spec["x"])
+    hit = _cache_load(cache_dir, cache_key(spec, X, y, n_splits, importance))
+    return hit["model"] if hit else None
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Expanding-window CV for the panel model specs")
+    ap.add_argument("--panel", default=PANEL)
+    ap.add_argument("--splits", type=int, default=5)
+    ap.add_argument("--importance", choices=["auto", "shap", "permutation"], default="auto")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--fresh", action="store_true", help="ignore cached results")
+    args = ap.parse_args(argv)
+
+    df = pd.read_parquet(args.panel)
+    specs = [s for s in SPECS if set(s["x"]) <= set(df.columns)]
+    for s in SPECS:
+        if s not in specs:
+            print(f"⚠️  {s['name']}: missing columns {sorted(set(s['x']) - set(df.columns))}, skipped")
+    t0 = time.perf_counter()
+    table, imps = evaluate(specs, df, n_splits=args.splits, importance=args.importance,
+                           workers=args.workers, fresh=args.fresh)
+    print(table.round(4).to_string(index=False))
+    print("\n📊 Importances")
+    print(imps.pivot(index="feature", columns="spec", values="importance").round(5).to_string())
+    print(f"\n🏁 {len(table)} specs ({int(table['cached'].sum())} cached) "
+          f"in {time.perf_counter() - t0:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# src/multi_match.py
+"""
+Aho-Corasick multi-keyword matcher.
+
+Builds one automaton over every pattern and finds all of them in a single
+left-to-right pass over the text, so scanning a filing costs the same
+whether a buyer has 2 deals or 500. Matching is case-insensitive plain
+substring search (same semantics as re.search(re.escape(kw), text, re.I)).
+
+  m = MultiMatcher({"DeepMind Technologies": "DeepMind", "Oculus": "Oculus"})
+  m.find(text)        # → {"DeepMind", "Oculus"} (labels that occur)
+"""
+from collections import deque
+
+class MultiMatcher:
+    def __init__(self, patterns):
+        """patterns: {pattern string: label}; several patterns may share a label."""
+        self.goto = [{}]      # state → {char: state}
+        self.fail = [0]
+        self.out  = [set()]   # state → labels ending here (incl. via fail links)
+        for pat, label in patterns.items():
+            if pat:
+                self._add(pat.lower(), label)
+        self._link()
+
+    def _add(self, pat, label):
+        s = 0
+        for ch in pat:
+            nxt = self.goto[s].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[s][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append(set())
+            s = nxt
+        self.out[s].add(label)
+
+    def _link(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            s = queue.popleft()
+            for ch, nxt in self.goto[s].items():
+                queue.append(nxt)
+                f = self.fail[s]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] |= self.out[self.fail[nxt]]
+
+    def find(self, text, stop_when=None):
+        """Set of labels whose patterns occur in text.
+        stop_when: optional set of labels — return early once all are found."""
+        goto, fail, out = self.goto, self.fail, self.out
+        found, s = set(), 0
+        for ch in (text or "").lower():
+            while s and ch not in goto[s]:
+                s = fail[s]
+            s = goto[s].get(ch, 0)
+            if out[s]:
+                found |= out[s]
+                if stop_when is not None and stop_when <= found:
+                    break
+        return found
@@ -0,0 +1,74 @@
+# src/panel_builder.py
+"""
+Build the (date × series) panel locally from the long series store.
+
+build_panel() reads the requested codes once, maps every observation to
+its quarter, and scatters all of them into a (quarter × series) matrix
+with a single np.add.at for the sums and one for the counts. Monthly,
+quarterly and annual series are therefore aligned in the same pass
+(monthly values average into their quarter instead of only the first
+month matching a quarterly date, as the old merge(on='date') did).
+
+  panel = build_panel({"GDPC1": "real_gdp", "UNRATE": "unemp_rate"})
+"""
+import numpy as np
+import pandas as pd
+from series_store import read_series
+
+# vw_macro's column names, so a local panel is a drop-in for the SQL pivot
+VW_MACRO_COLUMNS = {
+    "GDPC1":           "real_gdp",
+    "A679RC1Q027SBEA": "ict_inv",
+    "Y006RC1Q027SBEA": "priv_rd",
+    "USREC":           "recession_dummy",
+    "UNRATE":          "unemp_rate",
+    "CPIAUCSL":        "cpi",
+    "FEDFUNDS":        "fedfunds",
+    "CIVPART":         "lfpr",
+}
+
+def build_panel(codes, freq="Q", start=None, end=None, long_df=None):
+    """
+    Wide frame indexed by period start `date`, one column per code.
+
+    codes   : list of series codes, or {code: column_name} to rename
+    freq    : target pandas period frequency ("Q" or "Y")
+    long_df : an already-loaded (series_id, date, value) frame; read from
+              the series store when omitted
+    """
+    names = dict(codes) if isinstance(codes, dict) else {c: c for c in codes}
+    code_list = list(names)
+    if long_df is None:
+        long_df = read_series(code_list, start=start, end=end)
+    else:
+        long_df = long_df[long_df["series_id"].isin(code_list)]
+    long_df = long_df.dropna(subset=["value"])
+
+    # column index for each row's series, row index for each row's period
+    col = pd.Categorical(long_df["series_id"], categories=code_list).codes
+    periods = long_df["date"].dt.to_period(freq)
+    ordinals = periods.array.asi8
+    if len(ordinals):
+        lo, hi = ordinals.min(), ordinals.max()
+    else:
+        lo = hi = pd.Period(pd.Timestamp.today(), freq).ordinal
+    row = ordinals - lo
+
+    shape = (int(hi - lo + 1), len(code_list))
+    sums = np.zeros(shape)
+    counts = np.zeros(shape)
+    np.add.at(sums, (row, col), long_df["value"].to_numpy(dtype="float64"))
+    np.add.at(counts, (row, col), 1.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        matrix = sums / counts           # empty cells → NaN
+
+    index = pd.period_range(pd.Period(ordinal=lo, freq=freq), periods=shape[0], freq=freq)
+    panel = pd.DataFrame(matrix, index=index.to_timestamp(), columns=[names[c] for c in code_list])
+    panel.index.name = "date"
+    return panel.dropna(how="all")
+
+def with_date_id(panel):
+    """Add vw_macro's date_id (YYYYQ as int) and turn the index into a column."""
+    out = panel.reset_index()
+    out.insert(1, "date_id", out["date"].dt.year * 100 + out["date"].dt.quarter)
+    return out
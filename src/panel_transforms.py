@@ -0,0 +1,199 @@
+# src/panel_transforms.py
+"""
+Declarative feature transforms for the (date × series) panel.
+
+A spec is a list of steps, each producing one column:
+
+  {"name": "ict_g",  "op": "growth",    "col": "ict_inv"}
+  {"name": "ict_g",  "op": "winsorize", "col": "ict_g", "lo": -0.2, "hi": 0.2}
+  {"name": "rd_gdp", "op": "share",     "col": "priv_rd", "of": "real_gdp"}
+
+ops (n = rows, k/lag/periods in rows):
+  growth     x_t / x_{t−lag} − 1                      lag=1
+  logdiff    log x_t − log x_{t−lag}                  lag=1
+  yoy        growth over one year                     periods=4
+  rolling    k-row mean, NaN unless the window is full  k=4, center=False
+  annualize  (1 + x)^periods − 1                      periods=4
+  winsorize  clip to lo/hi, or to the q=(lo, hi) quantiles of the column
+  share      x / of
+
+A step may read the output of an earlier step; reusing a name replaces
+the column (as the winsorize line above does). compile_spec() orders the
+steps into dependency stages and groups each stage's steps by op and
+parameters, so apply() runs one NumPy operation per group over a block of
+columns of the float matrix rather than one pandas call per column: 200
+rolling means with the same k are a single cumsum.
+
+The notebook's features (FEATURES below) are cached next to the panel:
+
+  python src/panel_transforms.py     # → data/processed/wide_panel_features.parquet
+
+and recomputed only when the panel, the spec or this file changes.
+
+  from panel_transforms import apply, expand
+  df = apply(df, expand("rolling", ["gdp_g", "ict_g"], "_4q", k=4, center=True))
+"""
+import hashlib, json, os, sys
+import numpy as np
+import pandas as pd
+from fingerprint import file_digest, load_state, save_state
+
+PANEL         = "data/processed/wide_panel.parquet"
+FEATURES_PATH = "data/processed/wide_panel_features.parquet"
+MANIFEST      = "data/processed/.manifest.json"
+
+OPS = {"growth", "logdiff", "yoy", "rolling", "annualize", "winsorize", "share"}
+
+def expand(op, cols, suffix, **params):
+    """The same step for many columns: <col><suffix> for each col."""
+    return [{"name": f"{c}{suffix}", "op": op, "col": c, **params} for c in cols]
+
+# compute_wide_panel.py's shares, growth rates and ±20% clip
+CORE = [
+    {"name": "rd_gdp",      "op": "share",     "col": "priv_rd", "of": "real_gdp"},
+    {"name": "ict_gdp",     "op": "share",     "col": "ict_inv", "of": "real_gdp"},
+    {"name": "gdp_g",       "op": "growth",    "col": "real_gdp"},
+    {"name": "ict_g",       "op": "growth",    "col": "ict_inv"},
+    {"name": "rd_g",        "op": "growth",    "col": "priv_rd"},
+    {"name": "ict_g",       "op": "winsorize", "col": "ict_g", "lo": -0.2, "hi": 0.2},
+    {"name": "rd_g",        "op": "winsorize", "col": "rd_g",  "lo": -0.2, "hi": 0.2},
+    {"name": "ict_share_g", "op": "growth",    "col": "ict_gdp"},
+    {"name": "rd_share_g",  "op": "growth",    "col": "rd_gdp"},
+]
+
+# the notebook's 4-quarter means, annualized and year-over-year rates
+GROWTH_COLS = ["gdp_g", "ict_g", "rd_g", "ict_share_g", "rd_share_g"]
+FEATURES = [
+    *expand("rolling",   GROWTH_COLS, "_4q", k=4, center=True),
+    *expand("annualize", GROWTH_COLS, "_ann", periods=4),
+    *expand("yoy",       ["real_gdp", "ict_inv", "priv_rd"], "_yoy", periods=4),
+    *expand("logdiff",   ["real_gdp", "ict_inv", "priv_rd"], "_dlog"),
+]
+
+# ── compile ─────────────────────────────────────────────────────────
+def _params(step):
+    p = {k: v for k, v in step.items() if k not in ("name", "op", "col", "of")}
+    if step["op"] == "yoy":                       # yoy is growth at a year's lag
+        return "growth", {"lag": p.get("periods", 4)}
+    defaults = {"growth": {"lag": 1}, "logdiff": {"lag": 1},
+                "rolling": {"k": 4, "center": False}, "annualize": {"periods": 4},
+                "winsorize": {"lo": None, "hi": None, "q": None}, "share": {}}
+    return step["op"], {**defaults[step["op"]], **p}
+
+def compile_spec(spec, columns):
+    """
+    Plan for apply(): (groups, outputs, width). Each group is
+    (op, params, src, dst, of) with src/dst/of as column indices into the
+    working matrix, whose first len(columns) columns are the input frame.
+    """
+    where = {c: i for i, c in enumerate(columns)}    # name → latest column index
+    stage = {i: 0 for i in range(len(columns))}
+    groups, outputs = {}, []
+    for step in spec:
+        if step.get("op") not in OPS:
+            raise ValueError(f"unknown op {step.get('op')!r} in {step}")
+        needed = [step["col"]] + ([step["of"]] if step["op"] == "share" else [])
+        missing = [c for c in needed if c not in where]
+        if missing:
+            raise KeyError(f"{step['name']}: no column {missing[0]!r}")
+        op, params = _params(step)
+        if op == "rolling" and params["k"] < 1:
+            raise ValueError(f"{step['name']}: rolling needs k >= 1, got {params['k']}")
+        if op in ("growth", "logdiff") and params["lag"] < 0:
+            arg = "periods" if step["op"] == "yoy" else "lag"
+            raise ValueError(f"{step['name']}: {step['op']} needs {arg} >= 0, got {params['lag']}")
+        dst = len(columns) + len(outputs)
+        src, of = where[step["col"]], where.get(step.get("of"), -1)
+        stage[dst] = 1 + max(stage[src], stage.get(of, 0))
+        key = (stage[dst], op, json.dumps(params, sort_keys=True))
+        groups.setdefault(key, (op, params, [], [], []))
+        g = groups[key]
+        g[2].append(src); g[3].append(dst); g[4].append(of)
+        outputs.append(step["name"])
+        where[step["name"]] = dst
+    plan = [(op, params, np.array(s), np.array(d), np.array(o))
+            for (_, _, _), (op, params, s, d, o) in sorted(groups.items(), key=lambda kv: kv[0][0])]
+    return plan, outputs, len(columns) + len(outputs)
+
+# ── kernels: B is an (n, g) block of columns ────────────────────────
+def _lagged(B, lag):
+    out = np.full_like(B, np.nan)
+    out[lag:] = B[:-lag] if lag else B
+    return out
+
+def _rolling_mean(B, k, center):
+    n = len(B)
+    ok = np.isfinite(B)
+    cs = np.zeros((n + 1, B.shape[1])); np.cumsum(np.where(ok, B, 0.0), axis=0, out=cs[1:])
+    cn = np.zeros((n + 1, B.shape[1])); np.cumsum(ok, axis=0, out=cn[1:])
+    out = np.full_like(B, np.nan)
+    if k <= n:
+        full = (cn[k:] - cn[:-k]) == k
+        out[k - 1:] = np.where(full, (cs[k:] - cs[:-k]) / k, np.nan)
+    if center:                                   # pandas: window i−k//2 .. i−k//2+k−1
+        shift = k - 1 - k // 2
+        out = np.concatenate([out[shift:], np.full((shift, B.shape[1]), np.nan)])
+    return out
+
+def _run(op, params, B, D):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if op == "growth":
+            return B / _lagged(B, params["lag"]) - 1
+        if op == "logdiff":
+            L = np.log(B)
+            return L - _lagged(L, params["lag"])
+        if op == "rolling":
+            return _rolling_mean(B, params["k"], params["center"])
+        if op == "annualize":
+            return (1 + B) ** params["periods"] - 1
+        if op == "share":
+            return B / D
+        if op == "winsorize":
+            lo, hi = params["lo"], params["hi"]
+            if params["q"] is not None:
+                lo, hi = np.nanquantile(B, params["q"], axis=0)
+            return np.clip(B, lo, hi)
+    raise ValueError(op)
+
+def apply(df, spec):
+    """df plus the spec's columns (existing names are replaced in place), in one pass per op group."""
+    num = df.select_dtypes("number").columns.tolist()
+    plan, outputs, width = compile_spec(spec, num)
+    M = np.empty((len(df), width))
+    M[:, :len(num)] = df[num].to_numpy(dtype="float64")
+    for op, params, src, dst, of in plan:
+        M[:, dst] = _run(op, params, M[:, src], M[:, of] if op == "share" else None)
+
+    # last definition of each name wins
+    last = {name: len(num) + i for i, name in enumerate(outputs)}
+    new = pd.DataFrame(M[:, list(last.values())], columns=list(last), index=df.index)
+    out = df.copy()
+    replaced = [c for c in new.columns if c in out.columns]
+    out[replaced] = new[replaced]
+    return pd.concat([out, new.drop(columns=replaced)], axis=1)
+
+# ── cached feature file ─────────────────────────────────────────────
+def spec_hash(spec):
+    return hashlib.blake2b(json.dumps(spec, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+def features(panel=PANEL, spec=FEATURES, path=FEATURES_PATH, force=False):
+    """The panel plus spec's columns, from the cache file when panel, spec and code are unchanged."""
+    manifest = load_state(MANIFEST)
+    stat_cache = manifest.setdefault("stat_cache", {})
+    digest = ":".join([file_digest(__file__, stat_cache), file_digest(panel, stat_cache),
+                       spec_hash(spec)])
+    entry = manifest.setdefault("features", {}).get(path)
+    if not force and entry == digest and os.path.exists(path):
+        return pd.read_parquet(path)
+
+    df = apply(pd.read_parquet(panel), spec)
+    tmp = f"{path}.tmp"
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    manifest["features"][path] = digest
+    save_state(MANIFEST, manifest)
+    return df
+
+if __name__ == "__main__":
+    df = features(force="--force" in sys.argv[1:])
+    print(f"✔ {FEATURES_PATH}: {len(df)} rows × {df.shape[1]} columns")
@@ -1,85 +1,185 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
 from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
-from sklearn.decomposition import PCA
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.decomposition import PCA, IncrementalPCA
+from sklearn.metrics import silhouette_score
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-def cluster_tech_events(df, n_clusters=3, show_heatmap=True, show_pca=True):
-    # Step 1: Pivot the table wide
+# Above this many events, silhouette is scored on a random sample (it is O(n²))
+SILHOUETTE_SAMPLE = 5_000
+
+# ── features ────────────────────────────────────────────────────────
+def prepare_features(df):
+    """Long (Technology, Period, metrics...) frame → (pivot_df_clean, X_scaled, feature names)."""
+    # Pivot the table wide
     pivot_df = df.pivot(index='Technology', columns='Period')
     pivot_df.columns = ['_'.join(col).strip() for col in pivot_df.columns.values]
     pivot_df.reset_index(inplace=True)
 
-    # Step 2: Prepare features
-    features = pivot_df.drop('Technology', axis=1)
+    # ✅ Drop rows with missing values, keep only corresponding tech rows
+    features_clean = pivot_df.drop('Technology', axis=1).dropna()
+    pivot_df_clean = pivot_df.loc[features_clean.index].copy()
 
-    # ✅ Drop rows with missing values
-    features_clean = features.dropna()
+    X_scaled = StandardScaler().fit_transform(features_clean)
+    return pivot_df_clean, X_scaled, list(features_clean.columns)
 
-    # ✅ Keep only corresponding tech rows
-    pivot_df_clean = pivot_df.loc[features_clean.index].copy()
+# ── fitting ─────────────────────────────────────────────────────────
+def make_model(n_clusters, method="kmeans", random_state=42):
+    """KMeans for the timeline; MiniBatchKMeans for thousands of events."""
+    if method == "kmeans":
+        return KMeans(n_clusters=n_clusters, random_state=random_state, n_init=10)
+    if method == "minibatch":
+        return MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state,
+                               n_init=3, batch_size=1024)
+    raise ValueError(f"method must be 'kmeans' or 'minibatch', not {method!r}")
+
+_X = None            # standardized matrix, set once per sweep worker
+
+def _init_worker(X):
+    global _X
+    _X = X
+
+def _score_k(args):
+    k, method, random_state = args
+    model = make_model(k, method, random_state)
+    labels = model.fit_predict(_X)
+    sample = SILHOUETTE_SAMPLE if len(_X) > SILHOUETTE_SAMPLE else None
+    return {"k": k, "inertia": float(model.inertia_),
+            "silhouette": float(silhouette_score(_X, labels, sample_size=sample,
+                                                 random_state=random_state))}
+
+def sweep_k(X_scaled, k_range=range(2, 11), method="kmeans", random_state=42, workers=None):
+    """Fit every k in k_range on a process pool → DataFrame (k, inertia, silhouette).
+    The standardized matrix is shipped to each worker once, not once per k."""
+    ks = [k for k in k_range if 2 <= k < len(X_scaled)]
+    tasks = [(k, method, random_state) for k in ks]
+    workers = min(workers or os.cpu_count() or 1, len(tasks)) or 1
+    if workers == 1:
+        _init_worker(X_scaled)
+        rows = [_score_k(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(X_scaled,)) as pool:
+            rows = list(pool.map(_score_k, tasks))
+    return pd.DataFrame(rows, columns=["k", "inertia", "silhouette"])
+
+def project_2d(X_scaled, pca="full", batch_size=2_048):
+    """2-D PCA projection; pca="incremental" fits in batches for large event sets."""
+    if pca == "full":
+        return PCA(n_components=2).fit_transform(X_scaled)
+    if pca == "incremental":
+        ipca = IncrementalPCA(n_components=2, batch_size=max(batch_size, 2))
+        return ipca.fit_transform(X_scaled)
+    raise ValueError(f"pca must be 'full' or 'incremental', not {pca!r}")
+
+# ── plotting ────────────────────────────────────────────────────────
+def plot_cluster_heatmap(pivot_df_clean):
+    """Heatmap of average cluster behavior."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    numeric_cols = pivot_df_clean.select_dtypes(include='number').columns.drop('Cluster', errors='ignore')
+    cluster_avg = pivot_df_clean.groupby('Cluster')[numeric_cols].mean()
+
+    plt.figure(figsize=(12, 6))
+    sns.set_theme(style='whitegrid')
+    sns.heatmap(
+        cluster_avg,
+        cmap='coolwarm',
+        annot=True,
+        fmt=".1f",
+        linewidths=0.5,
+        cbar_kws={'label': 'Standardized Feature Value'}
+    )
+    plt.title(f"Cluster Averages Across {pivot_df_clean['Cluster'].nunique()} Tech Clusters")
+    plt.xticks(rotation=45, ha='right')
+    plt.tight_layout()
+    plt.show()
+
+def plot_pca(X_pca, pivot_df_clean, max_labels=50):
+    """PCA 2D scatter colored by cluster; point labels only for small event sets."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    plt.figure(figsize=(10, 7))
+    sns.scatterplot(
+        x=X_pca[:, 0],
+        y=X_pca[:, 1],
+        hue=pivot_df_clean['Cluster'].to_numpy(),
+        palette='tab10',
+        s=100 if len(X_pca) <= max_labels else 10,
+        legend="full"
+    )
 
-    # Step 3: Standardize features
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(features_clean)
+    if len(X_pca) <= max_labels:
+        for i, tech in enumerate(pivot_df_clean['Technology']):
+            plt.text(X_pca[i, 0]+0.02, X_pca[i, 1]+0.02, tech, fontsize=9)
+
+    plt.title("PCA Scatterplot of Technologies Colored by Cluster")
+    plt.xlabel("PCA 1")
+    plt.ylabel("PCA 2")
+    plt.grid(True)
+    plt.tight_layout()
+    plt.show()
+
+def plot_k_sweep(scores):
+    """Elbow (inertia) and silhouette curves from sweep_k()."""
+    import matplotlib.pyplot as plt
+    fig, axes = plt.subplots(1, 2, figsize=(12, 4))
+    axes[0].plot(scores['k'], scores['inertia'], marker='o')
+    axes[0].set_title('Inertia (elbow)')
+    axes[1].plot(scores['k'], scores['silhouette'], marker='o')
+    axes[1].set_title('Silhouette')
+    for ax in axes:
+        ax.set_xlabel('k')
+        ax.grid(True)
+    plt.tight_layout()
+    plt.show()
+
+# ── entry point ─────────────────────────────────────────────────────
+def cluster_tech_events(df, n_clusters=3, show_heatmap=True, show_pca=True,
+                        k_range=None, method="kmeans", pca="full", workers=None):
+    """
+    Cluster the events' Before/During/After profiles.
+
+    n_clusters=None with k_range (e.g. range(2, 11)) sweeps k in parallel and
+    keeps the best silhouette; the scores are on the result's .attrs["k_scores"].
+    k is clipped to 2..events−1; when no k is left (fewer than 3 events)
+    every event goes into a single cluster.
+    method="minibatch" and pca="incremental" scale to thousands of events.
+    """
+    pivot_df_clean, X_scaled, feature_cols = prepare_features(df)
 
-    # Step 4: Run KMeans clustering
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-    pivot_df_clean['Cluster'] = kmeans.fit_predict(X_scaled)
+    scores = None
+    if n_clusters is None:
+        scores = sweep_k(X_scaled, k_range or range(2, 11), method, workers=workers)
+        if scores.empty:                         # silhouette needs 2 <= k < number of events
+            n_clusters = 1
+            print(f"⚠️  {len(X_scaled)} events: no k in k_range to compare, using one cluster")
+        else:
+            print("\n📈 k sweep:")
+            print(scores.round(3).to_string(index=False))
+            n_clusters = int(scores.loc[scores['silhouette'].idxmax(), 'k'])
+            print(f"➤ best k by silhouette: {n_clusters}")
 
-    # Step 5: Output cluster centers
+    model = make_model(n_clusters, method)
+    pivot_df_clean['Cluster'] = model.fit_predict(X_scaled)
+
+    # Output cluster centers
     print("\n📊 Cluster Centers (standardized values):")
-    centers = pd.DataFrame(kmeans.cluster_centers_, columns=features_clean.columns)
+    centers = pd.DataFrame(model.cluster_centers_, columns=feature_cols)
     print(centers.round(2))
 
     print("\n🧠 Cluster Memberships:")
-    print(pivot_df_clean[['Technology', 'Cluster']].sort_values('Cluster'))
+    members = pivot_df_clean[['Technology', 'Cluster']].sort_values('Cluster')
+    print(members if len(members) <= 50 else members['Cluster'].value_counts().sort_index())
 
-    # Step 6: Heatmap of average cluster behavior
     if show_heatmap:
-        numeric_cols = pivot_df_clean.select_dtypes(include='number').columns.drop('Cluster', errors='ignore')
-        cluster_avg = pivot_df_clean.groupby('Cluster')[numeric_cols].mean()
-
-        plt.figure(figsize=(12, 6))
-        sns.set_theme(style='whitegrid')
-        sns.heatmap(
-            cluster_avg,
-            cmap='coolwarm',
-            annot=True,
-            fmt=".1f",
-            linewidths=0.5,
-            cbar_kws={'label': 'Standardized Feature Value'}
-        )
-        plt.title(f"Cluster Averages Across {n_clusters} Tech Clusters")
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        plt.show()
-
-    # Step 7: PCA 2D Scatter Plot
+        plot_cluster_heatmap(pivot_df_clean)
     if show_pca:
-        pca = PCA(n_components=2)
-        X_pca = pca.fit_transform(X_scaled)
-
-        plt.figure(figsize=(10, 7))
-        sns.scatterplot(
-            x=X_pca[:, 0],
-            y=X_pca[:, 1],
-            hue=pivot_df_clean['Cluster'],
-            palette='tab10',
-            s=100,
-            legend="full"
-        )
-
-        for i, tech in enumerate(pivot_df_clean['Technology']):
-            plt.text(X_pca[i, 0]+0.02, X_pca[i, 1]+0.02, tech, fontsize=9)
-
-        plt.title("PCA Scatterplot of Technologies Colored by Cluster")
-        plt.xlabel("PCA 1")
-        plt.ylabel("PCA 2")
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()
+        plot_pca(project_2d(X_scaled, pca), pivot_df_clean)
 
+    if scores is not None:
+        pivot_df_clean.attrs["k_scores"] = scores
     return pivot_df_clean
     #To run(    clustered_df = cluster_tech_events(df,n_clusters=3)    )
+    #Large event sets(    cluster_tech_events(df, n_clusters=None, k_range=range(2, 15), method="minibatch", pca="incremental")    )
@@ -0,0 +1,234 @@
+# src/pipeline_dag.py
+"""
+Incremental runner for the ETL scripts.
+
+Each stage below declares the script it runs, the files it reads and the
+files it writes. Dependencies are inferred by matching one stage's inputs
+against another's outputs (plus explicit "after" edges for stages that
+talk through MySQL instead of files).
+
+A stage is rebuilt only when
+  • the content hash of its script or any input file changed, or
+  • one of its declared outputs is missing, or
+  • an "after" stage it waits on actually ran in this invocation.
+Stages with no inputs (the FRED download) only run when an output is
+missing or they are forced, so a cold state file never triggers a refetch.
+Independent branches (FRED, BEA, Maddison, ...) run in parallel.
+Hashes live in .cache/pipeline_state.json; see fingerprint.py for the
+stat cache that makes a no-op rerun cost only stat() calls.
+
+Usage (from the project root):
+  python src/pipeline_dag.py                    # bring everything up to date
+  python src/pipeline_dag.py compute_wide_panel # that stage and what it needs
+  python src/pipeline_dag.py --force csv_to_p   # rebuild a stage regardless
+  python src/pipeline_dag.py --dry-run          # show what would run
+"""
+import argparse, glob, subprocess, sys, time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from fnmatch import fnmatch
+from pathlib import Path
+
+from fingerprint import file_digest, combine, load_state, save_state
+
+ROOT       = Path(__file__).resolve().parent.parent
+STATE_FILE = ROOT / ".cache" / "pipeline_state.json"
+
+# ── Stage graph ─────────────────────────────────────────────────────
+STAGES = [
+    {"name": "fetch_fred_data",     "script": "src/fetch_fred_data.py",
+     "inputs":  [],
+     "outputs": ["data/raw/fred/*.csv"]},
+    {"name": "csv_to_p",            "script": "src/csv_to_p.py",
+     "inputs":  ["data/raw/fred/*.csv", "data/processed/fred/*.csv"],
+     "outputs": ["data/clean/series_store.parquet"]},
+    {"name": "register_all_series", "script": "src/register_all_series.py",
+     "inputs":  ["data/clean/series_store.parquet"],
+     "outputs": []},
+    {"name": "load_macro",          "script": "src/load_macro.py",
+     "inputs":  ["data/clean/series_store.parquet"],
+     "outputs": [],
+     "after":   ["register_all_series"]},
+    {"name": "compute_wide_panel",  "script": "src/compute_wide_panel.py",
+     "inputs":  ["data/clean/series_store.parquet"],
+     "outputs": ["data/processed/wide_panel.parquet"],
+     "after":   ["load_macro"]},
+    {"name": "panel_transforms",    "script": "src/panel_transforms.py",
+     "inputs":  ["data/processed/wide_panel.parquet"],
+     "outputs": ["data/processed/wide_panel_features.parquet"]},
+    {"name": "normalize_inflation", "script": "src/normalize_inflation.py",
+     "inputs":  ["data/raw/fred/CPIAUCSL.csv", "data/raw/fred/Y006RC1Q027SBEA.csv",
+                 "data/raw/fred/Y057RC1Q027SBEA.csv"],
+     "outputs": ["data/processed/Y006RC1Q027SBEA_normalized.csv",
+                 "data/processed/Y057RC1Q027SBEA_normalized.csv"]},
+    {"name": "bea_extract",         "script": "src/bea_extract.py",
+     "inputs":  ["data/raw/bea/*.xlsx"],
+     "outputs": ["data/clean/bea/*.parquet"]},
+    {"name": "bea_store",           "script": "src/bea_store.py",
+     "inputs":  ["data/clean/bea/*.parquet"],
+     "outputs": ["data/clean/bea_store.parquet"]},
+    {"name": "clean_BEA",           "script": "src/clean_BEA.py",
+     "inputs":  ["data/raw/bea/gdp4q24-3rd.xlsx"],
+     "outputs": ["data/processed/bea/Table *_cleaned.csv"]},
+    {"name": "clean_BEAsignals",    "script": "src/clean_BEAsignals.py",
+     "inputs":  ["data/raw/bea/gdpkeysource-4q24-3rd.xlsx"],
+     "outputs": ["data/processed/bea/BEA_keysource_cleaned.csv"]},
+    {"name": "clean_footnotesBEA",  "script": "src/clean_footnotesBEA.py",
+     "inputs":  ["data/processed/bea/*.csv"],
+     "outputs": ["data/processed/bea/*.csv"]},          # rewrites in place
+    {"name": "bls_qcew",            "script": "src/bls_qcew.py",
+     "inputs":  ["data/raw/bls/*.csv"],
+     "outputs": ["data/clean/qcew/.manifest.json"]},
+    {"name": "clean_maddison",      "script": "src/clean_maddison.py",
+     "inputs":  ["data/raw/maddison/mpd2023_web.xlsx"],
+     "outputs": ["data/processed/maddison_gdp.csv", "data/clean/maddison/*"]},
+]
+
+def _overlaps(a, b):
+    return a == b or fnmatch(a, b) or fnmatch(b, a)
+
+def build_graph(stages):
+    """{name: set(upstream names)}; raises on cycles."""
+    deps = {s["name"]: set(s.get("after", [])) for s in stages}
+    for down in stages:
+        for up in stages:
+            if up is down:
+                continue
+            if any(_overlaps(i, o) for i in down["inputs"] for o in up["outputs"]):
+                deps[down["name"]].add(up["name"])
+
+    # Kahn's algorithm, only to reject cycles early
+    pending = {n: set(d) for n, d in deps.items()}
+    while pending:
+        ready = [n for n, d in pending.items() if not d]
+        if not ready:
+            raise ValueError(f"Cycle in stage graph: {sorted(pending)}")
+        for n in ready:
+            del pending[n]
+        for d in pending.values():
+            d.difference_update(ready)
+    return deps
+
+def _resolve(patterns):
+    files = set()
+    for pat in patterns:
+        files.update(glob.glob(str(ROOT / pat)))
+    return sorted(files)
+
+def _is_glob(pat):
+    return any(ch in pat for ch in "*?[")
+
+def missing_inputs(stage):
+    return [p for p in stage["inputs"] if not _is_glob(p) and not (ROOT / p).exists()]
+
+def missing_outputs(stage):
+    return [p for p in stage["outputs"] if not _resolve([p])]
+
+def stage_key(stage, stat_cache):
+    """Digest of the script plus every resolved input file."""
+    parts = [f"script={file_digest(ROOT / stage['script'], stat_cache)}"]
+    for path in _resolve(stage["inputs"]):
+        parts.append(f"{Path(path).relative_to(ROOT)}={file_digest(path, stat_cache)}")
+    return combine(parts)
+
+def select(stages, deps, targets):
+    """Targets plus everything upstream of them (all stages if no targets)."""
+    if not targets:
+        return {s["name"] for s in stages}
+    keep, todo = set(), list(targets)
+    while todo:
+        n = todo.pop()
+        if n not in keep:
+            keep.add(n)
+            todo.extend(deps[n])
+    return keep
+
+def run_script(stage):
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, str(ROOT / stage["script"])],
+                          cwd=ROOT, capture_output=True, text=True)
+    return proc, time.perf_counter() - t0
+
+def run(targets=(), force=(), jobs=4, dry_run=False):
+    """Bring the selected stages up to date. Returns {name: status}."""
+    by_name = {s["name"]: s for s in STAGES}
+    unknown = (set(targets) | set(force)) - set(by_name)
+    if unknown:
+        raise SystemExit(f"Unknown stage(s): {sorted(unknown)}")
+
+    deps      = build_graph(STAGES)
+    wanted    = select(STAGES, deps, targets)
+    state     = load_state(STATE_FILE)
+    stat_cache = state.setdefault("stat_cache", {})
+    keys      = state.setdefault("stages", {})
+    status    = {}                     # name → ran | fresh | blocked | failed
+
+    def decide(name):
+        stage = by_name[name]
+        upstream = deps[name] & wanted
+        if any(status[u] in ("blocked", "failed") for u in upstream):
+            return "blocked", None
+        if missing_inputs(stage):
+            print(f"⚠️  {name}: missing {missing_inputs(stage)}")
+            return "blocked", None
+        key = stage_key(stage, stat_cache)
+        if not stage["inputs"] and name not in force and not missing_outputs(stage):
+            keys[name] = key
+            return "fresh", key
+        if (name in force or keys.get(name) != key or missing_outputs(stage)
+                or any(status[u] == "ran" for u in stage.get("after", []) if u in wanted)):
+            return "run", key
+        return "fresh", key
+
+    t_start = time.perf_counter()
+    pending = set(wanted)
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        running = {}
+        while pending or running:
+            for name in sorted(pending):
+                if deps[name] & wanted <= set(status):
+                    pending.discard(name)
+                    verdict, _ = decide(name)
+                    if verdict != "run":
+                        status[name] = verdict
+                    elif dry_run:
+                        print(f"  would run {name}")
+                        status[name] = "ran"
+                    else:
+                        print(f"▶ {name}")
+                        running[pool.submit(run_script, by_name[name])] = name
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = running.pop(fut)
+                proc, secs = fut.result()
+                if proc.returncode == 0:
+                    # re-key after the run so in-place rewrites are not seen as changes
+                    keys[name] = stage_key(by_name[name], stat_cache)
+                    status[name] = "ran"
+                    print(f"✓ {name} ({secs:.1f}s)")
+                else:
+                    status[name] = "failed"
+                    print(f"❌ {name} failed ({secs:.1f}s)\n{proc.stdout}{proc.stderr}")
+
+    if not dry_run:
+        save_state(STATE_FILE, state)
+    ran = [n for n, s in status.items() if s == "ran"]
+    print(f"\n🏁 {len(ran)} stage(s) {'to run' if dry_run else 'ran'}, "
+          f"{sum(s == 'fresh' for s in status.values())} up to date "
+          f"in {time.perf_counter() - t_start:.2f}s")
+    return status
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("targets", nargs="*", help="stages to bring up to date")
+    ap.add_argument("--force", nargs="+", default=[], metavar="STAGE")
+    ap.add_argument("--jobs", type=int, default=4)
+    ap.add_argument("--dry-run", action="store_true")
+    args = ap.parse_args(argv)
+    status = run(args.targets, args.force, args.jobs, args.dry_run)
+    if "failed" in status.values():
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
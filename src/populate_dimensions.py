@@ -2,42 +2,13 @@
 populate_dimensions.py
 Populates the dim_date and dim_series tables in the econ_panel MySQL database.
 Run this before loading your macro data into fact_macro.
+Rows are upserted (INSERT ... ON DUPLICATE KEY UPDATE), so rerunning it,
+e.g. as part of run_pipeline.py, refreshes the tables instead of failing.
 """
 import pandas as pd
-from sqlalchemy import create_engine
-from dotenv import load_dotenv
-import os
+from sqlalchemy import text
+from db import get_engine
 
-# Load environment variables
-load_dotenv()
-
-user = os.getenv("MYSQL_USER", "root")
-pw   = os.getenv("MYSQL_PW", "")
-host = os.getenv("MYSQL_HOST", "localhost")
-port = os.getenv("MYSQL_PORT", "3306")
-db   = os.getenv("MYSQL_DB", "econ_panel")
-
-# Create SQLAlchemy engine
-engine = create_engine(
-    f"mysql+mysqlconnector://{user}:{pw}@{host}:{port}/{db}",
-    connect_args={"allow_local_infile": True}
-)
-
-# 1. Populate dim_date
-print("Populating dim_date...")
-dates = pd.date_range("1947-01-01", pd.Timestamp.today(), freq="QS")
-dim_date = pd.DataFrame({"date_actual": dates})
-dim_date = dim_date.assign(
-    year=lambda d: d.date_actual.dt.year,
-    quarter=lambda d: d.date_actual.dt.quarter,
-    year_qtr=lambda d: d.year.astype(str) + "-Q" + d.quarter.astype(str),
-    date_id=lambda d: d.year * 100 + d.quarter
-)
-dim_date.to_sql("dim_date", engine, if_exists="append", index=False, method="multi")
-print(f"Inserted {len(dim_date)} rows into dim_date")
-
-# 2. Populate dim_series
-print("Populating dim_series...")
 series_meta = [
     ("GDPC1",               "Real GDP",                       "Billions of 2017 dollars", "BEA/FRED"),
     ("UNRATE",              "Unemployment Rate",             "Percent",                 "BLS/FRED"),
@@ -57,6 +28,42 @@ series_meta = [
     ("USREC",               "NBER Recession Dummy",          "0/1",                     "NBER/FRED"),
     ("FDEFX",               "Defense Outlays (% GDP)",       "Percent of GDP",          "BEA/FRED"),
 ]
-dim_series = pd.DataFrame(series_meta, columns=["fred_code","series_name","units","source"])
-dim_series.to_sql("dim_series", engine, if_exists="append", index=False, method="multi")
-print(f"Inserted {len(dim_series)} rows into dim_series")
+
+def main():
+    engine = get_engine()
+
+    # 1. Populate dim_date
+    print("Populating dim_date...")
+    dates = pd.date_range("1947-01-01", pd.Timestamp.today(), freq="QS")
+    dim_date = pd.DataFrame({"date_actual": dates})
+    dim_date = dim_date.assign(
+        year=lambda d: d.date_actual.dt.year,
+        quarter=lambda d: d.date_actual.dt.quarter,
+        year_qtr=lambda d: d.year.astype(str) + "-Q" + d.quarter.astype(str),
+        date_id=lambda d: d.year * 100 + d.quarter
+    )
+    dim_date["date_actual"] = dim_date["date_actual"].dt.date
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO dim_date (date_id, date_actual, year_qtr, year, quarter)
+            VALUES (:date_id, :date_actual, :year_qtr, :year, :quarter)
+            ON DUPLICATE KEY UPDATE date_actual = VALUES(date_actual),
+              year_qtr = VALUES(year_qtr), year = VALUES(year), quarter = VALUES(quarter)
+        """), dim_date.to_dict("records"))
+    print(f"Upserted {len(dim_date)} rows into dim_date")
+
+    # 2. Populate dim_series
+    print("Populating dim_series...")
+    dim_series = pd.DataFrame(series_meta, columns=["fred_code","series_name","units","source"])
+    # fred_code is UNIQUE: existing series keep their series_id, metadata is refreshed
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO dim_series (fred_code, series_name, units, source)
+            VALUES (:fred_code, :series_name, :units, :source)
+            ON DUPLICATE KEY UPDATE series_name = VALUES(series_name),
+              units = VALUES(units), source = VALUES(source)
+        """), dim_series.to_dict("records"))
+    print(f"Upserted {len(dim_series)} rows into dim_series")
+
+if __name__ == "__main__":
+    main()
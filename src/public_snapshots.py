@@ -0,0 +1,146 @@
+# src/public_snapshots.py
+"""
+Batched public-company snapshot collector.
+
+Fetches market cap, employees and revenue for many tickers concurrently
+and appends them to a date-partitioned Parquet dataset:
+
+  data/clean/public_snapshots/date=YYYY-MM-DD/part-HHMMSS-<uuid>.parquet
+
+Appending a run writes one new part file, with a random suffix so two
+appends in the same second never collide; nothing already on disk is
+rewritten. read_snapshots() reads the dataset back, keeping the newest
+row per (ticker, date).
+
+A source is any callable ticker → dict of FIELDS. yfinance_quote is the
+live one (cached on disk for a day by http_cache); fake_source(csv) serves
+a local CSV with the same columns for offline runs:
+
+  python src/public_snapshots.py NVDA AAPL MSFT
+  python src/public_snapshots.py --fake src/public_yearly.csv --tickers-file tickers.txt
+"""
+import argparse, os, time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from uuid import uuid4
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from http_cache import cached, stats_line
+
+SNAPSHOT_DIR = "data/clean/public_snapshots"
+FIELDS = ["market_cap", "employees", "revenue"]
+SCHEMA = pa.schema([
+    ("ticker",       pa.string()),
+    ("market_cap",   pa.float64()),
+    ("employees",    pa.int64()),
+    ("revenue",      pa.float64()),
+    ("collected_at", pa.timestamp("us")),
+])
+
+# ── sources ────────────────────────────────────────────────
+@cached("yfinance")
+def yfinance_quote(ticker):
+    """Only the fields we use, with a single (slow) get_info() call per ticker."""
+    import yfinance as yf          # optional: not needed for fake runs
+    t = yf.Ticker(ticker)
+    info = t.get_info() or {}
+    return {
+        "market_cap": t.fast_info.get("marketCap") or info.get("marketCap"),
+        "employees":  info.get("fullTimeEmployees"),
+        "revenue":    info.get("totalRevenue"),
+    }
+
+def fake_source(csv_path):
+    """Quote source backed by a local CSV with a ticker column (for testing)."""
+    table = pd.read_csv(csv_path).set_index("ticker")
+    def quote(ticker):
+        if ticker not in table.index:
+            raise KeyError(f"{ticker} not in {csv_path}")
+        row = table.loc[ticker]
+        return {f: (None if pd.isna(row.get(f)) else row.get(f)) for f in FIELDS}
+    return quote
+
+# ── collect + store ────────────────────────────────────────
+def collect(tickers, source=yfinance_quote, workers=16):
+    """(frame of snapshots, {ticker: error}) for every ticker, fetched concurrently."""
+    def one(t):
+        try:
+            return t, source(t), None
+        except Exception as e:
+            return t, None, e
+
+    rows, errors = [], {}
+    now = datetime.now().replace(microsecond=0)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for t, fields, err in pool.map(one, tickers):
+            if err is not None:
+                errors[t] = err
+                continue
+            rows.append({"ticker": t, **{f: fields.get(f) for f in FIELDS}, "collected_at": now})
+    return pd.DataFrame(rows, columns=SCHEMA.names), errors
+
+def append_snapshots(df, root=SNAPSHOT_DIR, day=None):
+    """Write df as one new part file under date=<day>/; returns its path."""
+    if df.empty:
+        return None
+    day = day or date.today().isoformat()
+    part_dir = os.path.join(root, f"date={day}")
+    os.makedirs(part_dir, exist_ok=True)
+    path = os.path.join(part_dir, f"part-{time.strftime('%H%M%S')}-{uuid4().hex}.parquet")
+    table = pa.Table.from_pandas(df.astype({"market_cap": "float64", "employees": "Int64",
+                                            "revenue": "float64"}),
+                                 schema=SCHEMA, preserve_index=False)
+    tmp = f"{path}.tmp"
+    pq.write_table(table, tmp, compression="zstd")
+    os.replace(tmp, path)
+    return path
+
+def read_snapshots(tickers=None, start=None, end=None, root=SNAPSHOT_DIR):
+    """Snapshots as a frame (ticker, date, fields…), newest row per (ticker, date)."""
+    if not os.path.isdir(root):
+        return pd.DataFrame(columns=["ticker", "date", *FIELDS])
+    dataset = ds.dataset(root, format="parquet", partitioning="hive",
+                         exclude_invalid_files=True)
+    flt = None
+    def and_(a, b):
+        return b if a is None else a & b
+    if tickers is not None:
+        flt = and_(flt, ds.field("ticker").isin(list(tickers)))
+    if start is not None:
+        flt = and_(flt, ds.field("date") >= str(pd.Timestamp(start).date()))
+    if end is not None:
+        flt = and_(flt, ds.field("date") <= str(pd.Timestamp(end).date()))
+    df = dataset.to_table(filter=flt).to_pandas()
+    df["date"] = pd.to_datetime(df["date"].astype(str))
+    df = (df.sort_values(["ticker", "date", "collected_at"])
+            .drop_duplicates(["ticker", "date"], keep="last"))
+    return df[["ticker", "date", *FIELDS]].reset_index(drop=True)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Collect public-company snapshots")
+    ap.add_argument("tickers", nargs="*")
+    ap.add_argument("--tickers-file", help="one ticker per line")
+    ap.add_argument("--fake", metavar="CSV", help="serve quotes from a local CSV instead of yfinance")
+    ap.add_argument("--workers", type=int, default=16)
+    ap.add_argument("--root", default=SNAPSHOT_DIR)
+    args = ap.parse_args(argv)
+
+    tickers = list(args.tickers)
+    if args.tickers_file:
+        tickers += [l.strip() for l in open(args.tickers_file) if l.strip()]
+    if not tickers:
+        ap.error("no tickers given")
+
+    source = fake_source(args.fake) if args.fake else yfinance_quote
+    t0 = time.perf_counter()
+    df, errors = collect(tickers, source, args.workers)
+    path = append_snapshots(df, args.root)
+    for t, e in errors.items():
+        print(f"⚠️  {t}: {e}")
+    print(f"✅ {len(df)} snapshots → {path} in {time.perf_counter() - t0:.1f}s")
+    print(stats_line())
+
+if __name__ == "__main__":
+    main()
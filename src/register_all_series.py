@@ -1,31 +1,27 @@
 # src/register_series.py
-import glob
-import os
-from sqlalchemy import create_engine, text
-from dotenv import load_dotenv
+from sqlalchemy import text
+from db import get_engine
+from series_store import list_series
 
-load_dotenv()
+def main():
+    engine = get_engine()
 
-URL = (
-    f"mysql+mysqlconnector://{os.getenv('MYSQL_USER')}:"
-    f"{os.getenv('MYSQL_PW')}@{os.getenv('MYSQL_HOST')}:"
-    f"{os.getenv('MYSQL_PORT')}/{os.getenv('MYSQL_DB')}"
-)
-engine = create_engine(URL)
+    # 1. Gather all codes from the clean series store
+    codes = set(list_series())
+    print("Discovered codes:", codes)
 
-# 1. Gather all codes from your clean folder
-files = glob.glob("data/clean/fred_*.parquet")
-codes = {os.path.basename(f).replace("fred_","").replace(".parquet","") for f in files}
-print("Discovered codes:", codes)
+    # 2. For each code, insert if missing
+    with engine.begin() as conn:
+        for code in sorted(codes):
+            conn.execute(text("""
+                INSERT IGNORE INTO dim_series
+                  (fred_code, series_name, units, source)
+                VALUES
+                  (:c, :c, 'unknown', 'FRED')
+            """), {"c": code})
 
-# 2. For each code, insert if missing
-with engine.begin() as conn:
-    for code in sorted(codes):
-        conn.execute(text("""
-            INSERT IGNORE INTO dim_series
-              (fred_code, series_name, units, source)
-            VALUES
-              (:c, :c, 'unknown', 'FRED')
-        """), {"c": code})
+    print("✅ Registered all missing series codes.")
+    return codes
 
-print("✅ Registered all missing series codes.")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# src/rolling_ols.py
+"""
+Rolling and expanding (recursive) OLS with HC1 standard errors, for every
+window at once.
+
+Each window's regression only needs sums over its rows, so the engine
+keeps running (cumulative) sums and takes window sums as differences:
+
+  X'X, X'y, y'y          → coefficients and R²
+  Σ y²·xxᵀ, Σ y·xxᵀ⊗x, Σ xxᵀ⊗xxᵀ
+                          → the HC1 "meat" Σ eᵢ²·xᵢxᵢᵀ, because
+                            eᵢ² = y² − 2y·(xᵀb) + (xᵀb)² for the window's b
+
+That is O(n·k⁴) once, then O(k⁴) per window however long it is, and the
+per-window solves are one batched np.linalg call. With the handful of
+regressors used here (k ≤ 6) that is thousands of windows in milliseconds,
+where refitting statsmodels per window takes seconds per specification.
+
+Rows with a missing y or x are left out of every window (nobs counts the
+rows actually used). Windows with fewer than min_obs rows or a singular
+X'X (e.g. recession_dummy constant over the window) are dropped;
+min_obs defaults to the window length, so rolling output starts at the
+first full window.
+
+Output is tidy: one row per window end × term with coef, se, t, p_value,
+plus the window's start, nobs and r2.
+
+  python src/rolling_ols.py --y gdp_g --x ict_g rd_g --window 40
+  python src/rolling_ols.py --y gdp_g --x ict_g rd_g --expanding --out data/processed/rolling_ols.csv
+
+  from rolling_ols import rolling_ols
+  out = rolling_ols(df, "gdp_g", ["ict_g", "rd_g"], window=40)
+"""
+import argparse, math, os
+import numpy as np
+import pandas as pd
+
+PANEL = "data/processed/wide_panel.parquet"
+
+_erfc = np.vectorize(math.erfc, otypes=["float64"])
+
+def _p_normal(t):
+    """Two-sided normal p-value, 2·(1 − Φ(|t|)) = erfc(|t|/√2); NaN stays NaN."""
+    return _erfc(np.abs(t) / math.sqrt(2))
+
+def _cum(a):
+    """Cumulative sums along axis 0 with a leading zero row, so S[j] − S[i] sums rows i..j−1."""
+    out = np.zeros((len(a) + 1,) + a.shape[1:])
+    np.cumsum(a, axis=0, out=out[1:])
+    return out
+
+def rolling_ols(df, y, x, window=None, min_obs=None, time_col="date", const=True):
+    """
+    Tidy frame of coefficients for every window ending at each row of df
+    (sorted by time_col). window=None gives expanding windows from the first row.
+    """
+    x = [x] if isinstance(x, str) else list(x)
+    d = df.sort_values(time_col).reset_index(drop=True)
+    X = d[x].to_numpy(dtype="float64")
+    if const:
+        X = np.column_stack([np.ones(len(d)), X])
+    terms = (["const"] if const else []) + x
+    Y = d[y].to_numpy(dtype="float64")
+    n, k = X.shape
+    min_obs = max(min_obs or window or 0, k + 1)     # rolling: full windows only by default
+
+    valid = np.isfinite(Y) & np.isfinite(X).all(axis=1)
+    X = np.where(valid[:, None], X, 0.0)        # missing rows add nothing to the sums
+    Y = np.where(valid, Y, 0.0)
+
+    xx = X[:, :, None] * X[:, None, :]                      # (n, k, k)
+    S_n    = _cum(valid.astype("float64"))
+    S_xx   = _cum(xx)
+    S_xy   = _cum(X * Y[:, None])
+    S_yy   = _cum(Y * Y)
+    S_y    = _cum(Y)
+    S_yyxx = _cum(xx * (Y * Y)[:, None, None])
+    S_yxxx = _cum(xx[:, :, :, None] * (X * Y[:, None])[:, None, None, :])
+    S_xxxx = _cum(xx[:, :, :, None, None] * xx[:, None, None, :, :])
+
+    end = np.arange(1, n + 1)                               # window = rows start..end−1
+    start = np.zeros(n, dtype=int) if window is None else np.maximum(0, end - int(window))
+    w = lambda S: S[end] - S[start]
+    nobs = w(S_n).round().astype(int)
+    XtX, Xty = w(S_xx), w(S_xy)
+
+    ok = nobs >= min_obs
+    ok[ok] &= np.linalg.matrix_rank(XtX[ok]) == k
+    b = np.full((n, k), np.nan)
+    se = np.full((n, k), np.nan)
+    r2 = np.full(n, np.nan)
+    if ok.any():
+        inv = np.linalg.inv(XtX[ok])
+        bo = np.einsum("wij,wj->wi", inv, Xty[ok])
+        meat = (w(S_yyxx)[ok]
+                - 2 * np.einsum("wijl,wl->wij", w(S_yxxx)[ok], bo)
+                + np.einsum("wijlm,wl,wm->wij", w(S_xxxx)[ok], bo, bo))
+        no = nobs[ok]
+        cov = inv @ meat @ inv * (no / (no - k))[:, None, None]
+        b[ok] = bo
+        se[ok] = np.sqrt(np.clip(np.einsum("wii->wi", cov), 0, None))
+        sse = w(S_yy)[ok] - 2 * np.einsum("wi,wi->w", bo, Xty[ok]) \
+              + np.einsum("wi,wij,wj->w", bo, XtX[ok], bo)
+        sst = w(S_yy)[ok] - w(S_y)[ok] ** 2 / no
+        r2[ok] = 1 - sse / sst
+
+    t = b / se
+    times = d[time_col].to_numpy()
+    out = pd.DataFrame({
+        time_col:  np.repeat(times, k),
+        "start":   np.repeat(times[start], k),
+        "nobs":    np.repeat(nobs, k),
+        "r2":      np.repeat(r2, k),
+        "term":    np.tile(terms, n),
+        "coef":    b.reshape(-1),
+        "se":      se.reshape(-1),
+        "t":       t.reshape(-1),
+        "p_value": _p_normal(t.reshape(-1)),
+    })
+    return out[np.repeat(ok, k)].reset_index(drop=True)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Rolling / expanding OLS with HC1 errors")
+    ap.add_argument("--panel", default=PANEL)
+    ap.add_argument("--y", default="gdp_g")
+    ap.add_argument("--x", nargs="+", default=["ict_g", "rd_g"])
+    ap.add_argument("--window", type=int, default=40, help="rows (quarters) per window")
+    ap.add_argument("--expanding", action="store_true", help="expanding windows instead")
+    ap.add_argument("--min-obs", type=int, default=None)
+    ap.add_argument("--out", default=None, help="write the tidy frame to this CSV")
+    args = ap.parse_args(argv)
+
+    df = pd.read_parquet(args.panel)
+    out = rolling_ols(df, args.y, args.x, None if args.expanding else args.window, args.min_obs)
+    kind = "expanding" if args.expanding else f"{args.window}-row rolling"
+    print(f"✔ {out['date'].nunique()} {kind} windows, {args.y} ~ {' + '.join(args.x)}")
+    print(out.pivot(index="date", columns="term", values="coef").iloc[::8].round(4).to_string())
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        tmp = f"{args.out}.tmp"
+        out.to_csv(tmp, index=False)
+        os.replace(tmp, args.out)
+        print(f"✅ wrote {args.out}")
+
+if __name__ == "__main__":
+    main()
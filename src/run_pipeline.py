@@ -0,0 +1,77 @@
+# src/run_pipeline.py
+"""
+Run the database stages back to back in ONE process:
+
+  bootstrap_db → populate_dimensions → register_all_series → load_macro → compute_wide_panel
+
+All stages share the pooled engine from db.py, and the clean FRED frames
+read by load_macro are handed to compute_wide_panel instead of being read
+from disk again. Wall time for every stage is printed and appended to
+data/processed/pipeline_timings.csv so runs can be compared.
+
+Usage (from the project root):
+  python src/run_pipeline.py                     # every stage
+  python src/run_pipeline.py load_macro compute_wide_panel
+  python src/run_pipeline.py --bulk              # load_macro in bulk mode
+  python src/run_pipeline.py --local             # wide panel without vw_macro
+"""
+import os, sys, time
+from datetime import datetime
+import pandas as pd
+
+import bootstrap_db, populate_dimensions, register_all_series, load_macro, compute_wide_panel
+
+TIMINGS_CSV = "data/processed/pipeline_timings.csv"
+
+def build_stages(argv):
+    """(name, callable) pairs; callables take the shared frames dict."""
+    load_args = ["--bulk"] if "--bulk" in argv else []
+    local = "--local" in argv
+    return [
+        ("bootstrap_db",        lambda frames: bootstrap_db.main()),
+        ("populate_dimensions", lambda frames: populate_dimensions.main()),
+        ("register_all_series", lambda frames: register_all_series.main()),
+        ("load_macro",          lambda frames: load_macro.main(load_args, frames=frames)),
+        ("compute_wide_panel",  lambda frames: compute_wide_panel.main(frames=frames, local=local)),
+    ]
+
+def publish_timings(timings):
+    print("\n⏱  Stage timings")
+    for stage, secs, status in timings:
+        print(f"  {stage:<22} {secs:8.2f}s  {status}")
+    print(f"  {'total':<22} {sum(t[1] for t in timings):8.2f}s")
+
+    os.makedirs(os.path.dirname(TIMINGS_CSV), exist_ok=True)
+    run_at = datetime.now().isoformat(timespec="seconds")
+    log = pd.DataFrame(timings, columns=["stage", "seconds", "status"])
+    log.insert(0, "run_at", run_at)
+    log.to_csv(TIMINGS_CSV, mode="a", index=False,
+               header=not os.path.exists(TIMINGS_CSV))
+    print(f"  ➤ appended to {TIMINGS_CSV}")
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    stages = build_stages(argv)
+    wanted = [a for a in argv if not a.startswith("--")]
+    unknown = set(wanted) - {name for name, _ in stages}
+    if unknown:
+        raise SystemExit(f"Unknown stage(s): {sorted(unknown)}")
+    if wanted:
+        stages = [(name, fn) for name, fn in stages if name in wanted]
+
+    frames, timings = {}, []
+    for name, fn in stages:
+        print(f"\n━━ {name} ━━")
+        t0 = time.perf_counter()
+        try:
+            fn(frames)
+        except Exception as e:
+            timings.append((name, time.perf_counter() - t0, f"failed: {e}"))
+            publish_timings(timings)
+            raise
+        timings.append((name, time.perf_counter() - t0, "ok"))
+
+    publish_timings(timings)
+
+if __name__ == "__main__":
+    main()
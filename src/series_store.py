@@ -0,0 +1,86 @@
+# src/series_store.py
+"""
+Consolidated long-format store for every FRED series:
+
+  data/clean/series_store.parquet   columns (series_id, date, value)
+
+Rows are sorted by (series_id, date) and each series is its own row group,
+so the footer's min/max statistics tell a reader exactly which row groups
+hold a given code. read_series() memory-maps the file and pushes the
+series/date predicates down, touching only those row groups; one file open
+and one fixed schema replace globbing fred_*.parquet and guessing the value
+column from df.columns[1].
+"""
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+STORE_PATH = "data/clean/series_store.parquet"
+SCHEMA = pa.schema([
+    ("series_id", pa.string()),
+    ("date",      pa.timestamp("us")),
+    ("value",     pa.float64()),
+])
+
+def to_long(code, df):
+    """(date, <anything>) frame → (series_id, date, value) frame."""
+    return pd.DataFrame({
+        "series_id": code,
+        "date":  pd.to_datetime(df.iloc[:, 0]),
+        "value": pd.to_numeric(df.iloc[:, 1], errors="coerce").astype("float64"),
+    })
+
+def write_store(long_df, path=STORE_PATH):
+    """Write a long frame sorted by series, one row group per series, atomically."""
+    long_df = long_df.sort_values(["series_id", "date"], kind="stable")
+    table = pa.Table.from_pandas(long_df[["series_id", "date", "value"]],
+                                 schema=SCHEMA, preserve_index=False)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    codes = long_df["series_id"].to_numpy()
+    # boundaries of each series' run in the sorted table
+    starts = np.r_[0, np.flatnonzero(codes[1:] != codes[:-1]) + 1] if len(codes) else []
+    bounds = zip(starts, list(starts[1:]) + [len(codes)])
+    try:
+        with pq.ParquetWriter(tmp, SCHEMA, compression="zstd",
+                              use_dictionary=["series_id"]) as writer:
+            for lo, hi in bounds:
+                writer.write_table(table.slice(lo, hi - lo), row_group_size=int(hi - lo))
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return len(starts) if len(codes) else 0
+
+def list_series(path=STORE_PATH):
+    """Series codes in the store, read from row-group statistics only."""
+    meta = pq.ParquetFile(path).metadata
+    col = meta.schema.names.index("series_id")
+    codes = []
+    for rg in range(meta.num_row_groups):
+        stats = meta.row_group(rg).column(col).statistics
+        codes.append(stats.min)
+    return sorted(set(codes))
+
+def read_series(codes=None, start=None, end=None, path=STORE_PATH):
+    """Long (series_id, date, value) frame for the requested codes/date range."""
+    filters = []
+    if codes is not None:
+        filters.append(("series_id", "in", list(codes)))
+    if start is not None:
+        filters.append(("date", ">=", pd.Timestamp(start).to_pydatetime()))
+    if end is not None:
+        filters.append(("date", "<=", pd.Timestamp(end).to_pydatetime()))
+    table = pq.read_table(path, filters=filters or None, memory_map=True)
+    return table.to_pandas()
+
+def read_frames(codes=None, path=STORE_PATH):
+    """{code: DataFrame[date, <code>]} — the shape the old per-file parquets had."""
+    long_df = read_series(codes, path=path)
+    return {
+        code: grp[["date", "value"]].rename(columns={"value": code}).reset_index(drop=True)
+        for code, grp in long_df.groupby("series_id", sort=True)
+    }
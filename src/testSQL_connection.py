@@ -1,19 +1,9 @@
 # test_connection.py
-from sqlalchemy import create_engine, text
-from dotenv import load_dotenv
-import os
+from sqlalchemy import text
+from db import get_engine
 
-# 1. Load the same .env credentials
-load_dotenv()
-user = os.getenv("MYSQL_USER", "root")
-pw   = os.getenv("MYSQL_PW", "")
-host = os.getenv("MYSQL_HOST", "localhost")
-port = os.getenv("MYSQL_PORT", "3306")
-db   = os.getenv("MYSQL_DB", "econ_panel")
-
-# 2. Build the engine just like your loader does
-url = f"mysql+mysqlconnector://{user}:{pw}@{host}:{port}/{db}"
-engine = create_engine(url, connect_args={"allow_local_infile": True})
+# 1-2. Same .env credentials and pooled engine the loaders use
+engine = get_engine()
 
 # 3. Open a connection and run a quick test
 with engine.connect() as conn:
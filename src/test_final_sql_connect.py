@@ -6,20 +6,10 @@ Quick sanity check that you can:
   2) read dim_date and dim_series counts,
   3) see fact_macro (probably zero until you load it).
 """
-from sqlalchemy import create_engine, text
-from dotenv import load_dotenv
-import os
+from sqlalchemy import text
+from db import get_engine
 
-load_dotenv()
-
-USER = os.getenv("MYSQL_USER", "root")
-PW   = os.getenv("MYSQL_PW", "")
-HOST = os.getenv("MYSQL_HOST", "localhost")
-PORT = os.getenv("MYSQL_PORT", "3306")
-DB   = os.getenv("MYSQL_DB", "econ_panel")
-
-url = f"mysql+mysqlconnector://{USER}:{PW}@{HOST}:{PORT}/{DB}"
-engine = create_engine(url, connect_args={"allow_local_infile": True})
+engine = get_engine()
 
 with engine.connect() as conn:
     one = conn.execute(text("SELECT 1")).scalar_one()
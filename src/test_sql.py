@@ -1,16 +1,7 @@
-from dotenv import load_dotenv
-import os
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
+from db import get_engine
 
-load_dotenv()
-
-user = os.getenv("MYSQL_USER")
-pw   = os.getenv("MYSQL_PW")
-host = os.getenv("MYSQL_HOST", "localhost")
-port = os.getenv("MYSQL_PORT", "3306")
-
-url = f"mysql+mysqlconnector://{user}:{pw}@{host}:{port}"
-engine = create_engine(url, connect_args={"allow_local_infile": True})
+engine = get_engine(with_db=False)
 
 # --- v2 pattern -------------------------------------------------
 with engine.connect() as conn:
@@ -0,0 +1,109 @@
+# src/vintage_store.py
+"""
+Revision-aware vintage store for FRED series.
+
+Every fetch is diffed against the series' latest vintage and only the
+observations that changed are kept:
+
+  data/vintages/<code>/<realtime>.parquet   columns (date, value, deleted)
+
+<realtime> is the fetch date (YYYY-MM-DD). A part holds new dates,
+revised values, and rows that disappeared (deleted=True). A fetch that
+changes nothing writes no file, so storage grows with the number of
+revisions, not with history length × number of fetches.
+
+The sorted part names are the index: as_of(code, "2024-06-30") bisects
+them and reads only the parts at or before that date, then keeps the
+latest value per observation date.
+"""
+import os
+from bisect import bisect_right
+from datetime import date
+import numpy as np
+import pandas as pd
+
+VINTAGE_DIR = "data/vintages"
+
+def _series_dir(code, root):
+    return os.path.join(root, code)
+
+def vintages(code, root=VINTAGE_DIR):
+    """Sorted realtime stamps stored for a series."""
+    d = _series_dir(code, root)
+    if not os.path.isdir(d):
+        return []
+    return sorted(f[:-len(".parquet")] for f in os.listdir(d) if f.endswith(".parquet"))
+
+def _read_parts(code, stamps, root):
+    d = _series_dir(code, root)
+    parts = []
+    for rt in stamps:
+        part = pd.read_parquet(os.path.join(d, f"{rt}.parquet"))
+        part["realtime"] = rt
+        parts.append(part)
+    return parts
+
+def _empty():
+    return pd.DataFrame({"date": pd.Series(dtype="datetime64[ns]"),
+                         "value": pd.Series(dtype="float64")})
+
+def as_of(code, when=None, root=VINTAGE_DIR):
+    """(date, value) snapshot of the series as it was known on `when` (default: latest)."""
+    stamps = vintages(code, root)
+    if when is not None:
+        stamps = stamps[:bisect_right(stamps, pd.Timestamp(when).strftime("%Y-%m-%d"))]
+    parts = _read_parts(code, stamps, root)
+    if not parts:
+        return _empty()
+    log = pd.concat(parts, ignore_index=True)
+    # parts are concatenated oldest → newest, so "last" is the newest value
+    snap = log.drop_duplicates("date", keep="last")
+    snap = snap[~snap["deleted"]].sort_values("date")
+    return snap[["date", "value"]].reset_index(drop=True)
+
+def diff(old, new):
+    """Rows of `new` that are new or revised, plus deletions from `old`."""
+    m = old.merge(new, on="date", how="outer", suffixes=("_old", ""), indicator=True)
+    same = (m["value_old"] == m["value"]) | (m["value_old"].isna() & m["value"].isna())
+    changed = m[(m["_merge"] == "right_only") | ((m["_merge"] == "both") & ~same)]
+    gone = m[m["_merge"] == "left_only"]
+    out = pd.concat([
+        changed[["date", "value"]].assign(deleted=False),
+        gone[["date"]].assign(value=np.nan, deleted=True),
+    ], ignore_index=True)
+    return out.sort_values("date").reset_index(drop=True)
+
+def record_vintage(code, df, realtime=None, root=VINTAGE_DIR):
+    """
+    Store the changes in a freshly fetched (date, value) frame.
+    Returns the number of changed observations (0 → nothing written).
+    """
+    realtime = realtime or date.today().isoformat()
+    new = pd.DataFrame({
+        "date":  pd.to_datetime(df.iloc[:, 0]),
+        "value": pd.to_numeric(df.iloc[:, 1], errors="coerce").astype("float64"),
+    })
+    # a same-day refetch replaces that day's part, so diff against the day before
+    stamps = [s for s in vintages(code, root) if s < realtime]
+    base = as_of(code, stamps[-1], root) if stamps else _empty()
+    changes = diff(base, new)
+
+    path = os.path.join(_series_dir(code, root), f"{realtime}.parquet")
+    if changes.empty:
+        if os.path.exists(path):
+            os.remove(path)         # today's earlier fetch was undone by this one
+        return 0
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    changes.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    return len(changes)
+
+def revision_history(code, obs_date, root=VINTAGE_DIR):
+    """Every stored value of one observation date, oldest first."""
+    stamps = vintages(code, root)
+    log = pd.concat(_read_parts(code, stamps, root), ignore_index=True) if stamps else None
+    if log is None:
+        return pd.DataFrame(columns=["realtime", "value", "deleted"])
+    hit = log[log["date"] == pd.Timestamp(obs_date)]
+    return hit[["realtime", "value", "deleted"]].reset_index(drop=True)